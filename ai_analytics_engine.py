@@ -365,13 +365,13 @@ class AIAnalyticsEngine:
         try:
             # 1. Database Statistics
             if self.lead_db:
-                analysis_results['database_stats'] = self.lead_db.get_dashboard_stats()
+                analysis_results['database_stats'] = await self.lead_db.get_dashboard_stats_async()
                 logger.info("✅ Database statistics generated")
             
             # 2. Lead Analysis
             if self.lead_db:
-                hot_leads = self.lead_db.get_hot_leads(limit=50)
-                follow_ups = self.lead_db.get_follow_up_needed(days_threshold=3)
+                hot_leads = await self.lead_db.get_hot_leads_async(limit=50)
+                follow_ups = await self.lead_db.get_follow_up_needed_async(days_threshold=3)
                 
                 analysis_results['lead_analysis'] = {
                     'hot_leads_count': len(hot_leads),
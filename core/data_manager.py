@@ -7,6 +7,7 @@ and robust failover between local SQLite and Google Sheets.
 """
 
 import os
+import re
 import json
 import sqlite3
 import logging
@@ -16,6 +17,8 @@ import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union, Tuple
 from dataclasses import dataclass, asdict, field
+from collections import OrderedDict
+from functools import lru_cache, wraps
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 from queue import Queue
@@ -29,8 +32,212 @@ try:
 except ImportError:
     GOOGLE_SHEETS_AVAILABLE = False
 
+# Faster JSON decoding for list columns
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Username indicators for contact enrichment - simple extraction, can be enhanced with AI
+COMPANY_INDICATORS = ('corp', 'inc', 'ltd', 'co', 'tech', 'ai', 'digital', 'media')
+ROLE_INDICATORS = {
+    'ceo': 'CEO',
+    'cto': 'CTO',
+    'cfo': 'CFO',
+    'founder': 'Founder',
+    'cofounder': 'Co-Founder',
+    'manager': 'Manager',
+    'director': 'Director',
+    'lead': 'Lead',
+    'senior': 'Senior',
+    'junior': 'Junior'
+}
+INDUSTRY_INDICATORS = {
+    'tech': 'Technology',
+    'ai': 'Artificial Intelligence',
+    'fintech': 'Financial Technology',
+    'health': 'Healthcare',
+    'edu': 'Education',
+    'media': 'Media',
+    'marketing': 'Marketing',
+    'sales': 'Sales',
+    'consulting': 'Consulting',
+    'realestate': 'Real Estate'
+}
+
+# Write-path statements are kept as module constants so every call hands
+# sqlite3 the identical string and hits its prepared-statement cache
+_STATEMENT_CACHE_SIZE = 128
+
+_INSERT_MSG_SQL = '''
+    INSERT OR REPLACE INTO messages (
+        id, message_id, chat_id, chat_title, user_id, username, first_name, last_name,
+        message_text, message_type, timestamp, content_hash, sentiment_score,
+        keywords, is_duplicate, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_UPSERT_CONTACT_SQL = '''
+    INSERT INTO contacts (
+        id, name, username, category, priority, message_count,
+        last_message_date, lead_score, created_at, updated_at
+    ) VALUES (?, ?, ?, 'contact', 1, 1, ?, 0.0, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name = excluded.name,
+        username = excluded.username,
+        message_count = message_count + 1,
+        last_message_date = excluded.last_message_date,
+        updated_at = excluded.updated_at
+'''
+
+# Categorization and scoring mirror DataManager._categorize_contact and
+# _calculate_lead_score but are evaluated by SQLite per group. LIMIT is
+# bound as a parameter (-1 means unlimited) so one plan serves every call.
+_CONTACTS_SQL = """
+    SELECT
+        user_id,
+        COALESCE(username, '') as username,
+        COALESCE(first_name, '') as first_name,
+        COALESCE(last_name, '') as last_name,
+        COALESCE(NULLIF(TRIM(COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), ''),
+                 'User ' || user_id) as name,
+        message_count,
+        last_message_date,
+        avg_sentiment,
+        positive_messages,
+        negative_messages,
+        CASE
+            WHEN message_count > 50 AND avg_sentiment > 0.3 THEN 'High-Value Lead'
+            WHEN message_count > 20 AND avg_sentiment > 0 THEN 'Active Contact'
+            WHEN message_count > 10 THEN 'Regular Contact'
+            WHEN avg_sentiment > 0.5 THEN 'Positive Contact'
+            ELSE 'Contact'
+        END as category,
+        MIN(
+            MIN(message_count / 100.0, 0.4)
+            + MAX(avg_sentiment, 0) * 0.3
+            + CASE WHEN positive_messages + negative_messages > 0
+                   THEN positive_messages * 0.3 / (positive_messages + negative_messages)
+                   ELSE 0 END,
+            1.0
+        ) as lead_score
+    FROM (
+        SELECT
+            user_id,
+            username,
+            first_name,
+            last_name,
+            COUNT(*) as message_count,
+            MAX(timestamp) as last_message_date,
+            COALESCE(AVG(sentiment_score), 0) as avg_sentiment,
+            COUNT(CASE WHEN sentiment_score > 0.5 THEN 1 END) as positive_messages,
+            COUNT(CASE WHEN sentiment_score < -0.5 THEN 1 END) as negative_messages
+        FROM messages
+        WHERE user_id IS NOT NULL AND user_id != 0
+        GROUP BY user_id, username, first_name, last_name
+    )
+    ORDER BY message_count DESC, last_message_date DESC
+    LIMIT ?
+"""
+
+# One pass over the username: at each position a lookahead per field reports
+# the indicator starting there, so overlapping indicators are all seen
+_INDICATOR_FIELDS = {
+    'company': COMPANY_INDICATORS,
+    'role': tuple(ROLE_INDICATORS),
+    'industry': tuple(INDUSTRY_INDICATORS)
+}
+_INDICATOR_RE = re.compile(''.join(
+    f"(?=(?P<{name}>{'|'.join(map(re.escape, indicators))}))?"
+    for name, indicators in _INDICATOR_FIELDS.items()
+))
+_COMPANY_RE = re.compile('|'.join(map(re.escape, COMPANY_INDICATORS)))
+# Earlier indicators take precedence, matching dict iteration order
+_INDICATOR_RANK = {
+    name: {indicator: rank for rank, indicator in enumerate(indicators)}
+    for name, indicators in _INDICATOR_FIELDS.items()
+}
+
+@lru_cache(maxsize=16384)
+def _extract_all(username: str) -> Tuple[str, str, str]:
+    """Extract (company, role, industry) from a username in one cached call"""
+    found = {}
+    for match in _INDICATOR_RE.finditer(username.lower()):
+        for name, indicator in match.groupdict().items():
+            if indicator and (name not in found or
+                              _INDICATOR_RANK[name][indicator] < _INDICATOR_RANK[name][found[name]]):
+                found[name] = indicator
+    
+    if '@' in username:
+        company_name = username.split('@')[1]
+        has_company = _COMPANY_RE.search(company_name.lower()) is not None
+    else:
+        company_name = username
+        has_company = 'company' in found
+    
+    company = company_name.title() if has_company else "N/A"
+    role = ROLE_INDICATORS[found['role']] if 'role' in found else "N/A"
+    industry = INDUSTRY_INDICATORS[found['industry']] if 'industry' in found else "N/A"
+    return company, role, industry
+
+# Google Sheets column layout per entity type: (field, default) in column order,
+# followed by a trailing sync timestamp column
+_SHEET_ROW_SCHEMAS = {
+    'message': (
+        ('id', ''), ('message_id', ''), ('chat_id', ''), ('chat_title', ''),
+        ('user_id', ''), ('username', ''), ('first_name', ''), ('last_name', ''),
+        ('message_text', ''), ('message_type', ''), ('timestamp', ''),
+        ('sentiment_score', 0), ('keywords', ''), ('is_duplicate', False)
+    ),
+    'note': (
+        ('id', ''), ('text', ''), ('timestamp', ''), ('category', ''),
+        ('priority', ''), ('tags', ''), ('completed', False)
+    ),
+    'contact': (
+        ('user_id', ''), ('username', ''), ('name', ''), ('message_count', 0),
+        ('lead_score', 0), ('category', ''), ('company', ''), ('role', ''),
+        ('industry', ''), ('last_message_date', '')
+    ),
+    'analysis': (
+        ('chat_id', ''), ('chat_title', ''), ('sentiment_score', 0), ('key_topics', ''),
+        ('business_opportunities', ''), ('recommendations', ''), ('message_count', 0),
+        ('participants', 0), ('timestamp', '')
+    )
+}
+
+def _compile_row_builder(schema: Tuple[Tuple[str, Any], ...]):
+    """Generate a straight-line row builder for one schema (no per-row loop or branching)"""
+    columns = ', '.join(f"get({key!r}, {default!r})" for key, default in schema)
+    source = f"def build_row(data, synced_at):\n    get = data.get\n    return [{columns}, synced_at]\n"
+    namespace = {}
+    exec(source, namespace)
+    return namespace['build_row']
+
+_SHEET_ROW_BUILDERS = {
+    entity_type: _compile_row_builder(schema)
+    for entity_type, schema in _SHEET_ROW_SCHEMAS.items()
+}
+
+def _ttl_cached(ttl: float):
+    """Memoize a DataManager read in self.cache for a short TTL, keyed by method and args"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.time()
+            cached = self.cache.get(key)
+            if cached and now - cached[1] < ttl:
+                return cached[0]
+            value = method(self, *args, **kwargs)
+            self.cache[key] = (value, now)
+            self.cache.move_to_end(key)
+            return value
+        return wrapper
+    return decorator
+
 @dataclass
 class SyncStatus:
     """Sync status tracking"""
@@ -126,11 +333,19 @@ class DataManager:
         
         # Sync management
         self.sync_lock = threading.Lock()
-        self.sync_queue = Queue()
+        self.sync_queue = asyncio.Queue()
         self.sync_worker_running = False
+        self._sheet_row_index: Dict[str, Dict[str, int]] = {}
+        
+        # Buffered sync status updates: {sync_id: (status, error, retry_increment, attempted_at)}
+        self._pending_status: Dict[str, Tuple] = {}
+        self._pending_status_lock = asyncio.Lock()
+        self._status_flush_task = None
+        self.status_flush_interval = 0.05  # seconds
+        self.status_flush_size = 100
         
         # Performance optimization
-        self.cache = {}
+        self.cache = OrderedDict()  # insertion-ordered by timestamp, oldest first
         self.cache_ttl = 300  # 5 minutes
         self.last_cache_cleanup = time.time()
         
@@ -139,7 +354,8 @@ class DataManager:
     def _init_connection_pool(self):
         """Initialize database connection pool"""
         for _ in range(10):
-            conn = sqlite3.connect(self.local_db_path, check_same_thread=False)
+            conn = sqlite3.connect(self.local_db_path, check_same_thread=False,
+                                   cached_statements=_STATEMENT_CACHE_SIZE)
             conn.execute('PRAGMA journal_mode=WAL')
             conn.execute('PRAGMA synchronous=NORMAL')
             conn.execute('PRAGMA cache_size=10000')
@@ -151,7 +367,8 @@ class DataManager:
         try:
             return self.connection_pool.get(timeout=5)
         except:
-            conn = sqlite3.connect(self.local_db_path, check_same_thread=False)
+            conn = sqlite3.connect(self.local_db_path, check_same_thread=False,
+                                   cached_statements=_STATEMENT_CACHE_SIZE)
             conn.execute('PRAGMA journal_mode=WAL')
             return conn
     
@@ -268,7 +485,10 @@ class DataManager:
         ''')
         
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_sync_entity ON sync_status(entity_type, entity_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sync_status ON sync_status(sync_status)')
+        # Composite index serves both the status GROUP BY (index-only scan) and the
+        # failed-sync retry range scan ordered by last attempt
+        cursor.execute('DROP INDEX IF EXISTS idx_sync_status')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sync_status_status ON sync_status(sync_status, last_sync_attempt)')
         
         conn.commit()
         conn.close()
@@ -310,6 +530,8 @@ class DataManager:
     
     def _generate_hash(self, content: str) -> str:
         """Generate content hash for duplicate detection"""
+        # Persisted as messages/notes content_hash and compared against existing rows, so it must
+        # stay MD5 regardless of which optional hashing libraries are installed
         return hashlib.md5(content.encode('utf-8')).hexdigest()
     
     def _serialize_list(self, data: List[str]) -> str:
@@ -318,8 +540,11 @@ class DataManager:
     
     def _deserialize_list(self, data: str) -> List[str]:
         """Deserialize JSON string to list"""
+        # Most rows store an empty list; skip the parser for them entirely
+        if not data or data == '[]':
+            return []
         try:
-            return json.loads(data) if data else []
+            return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
         except:
             return []
     
@@ -353,6 +578,7 @@ class DataManager:
             # Store in local database
             success = await self._store_message_local(message)
             if success:
+                self._invalidate_cache('get_chat_list')
                 # Queue for sync
                 await self._queue_for_sync('message', message.id, content_hash)
                 return True, "Message added successfully"
@@ -555,7 +781,15 @@ class DataManager:
             local_hash=content_hash
         )
         
-        # Store sync status
+        # Store sync status off the event loop
+        await asyncio.to_thread(self._store_sync_status, sync_status)
+        self._invalidate_cache('get_sync_status')
+        
+        # Add to sync queue
+        await self.sync_queue.put(sync_status)
+    
+    def _store_sync_status(self, sync_status: SyncStatus):
+        """Persist a queued sync status row"""
         conn = None
         try:
             conn = sqlite3.connect(self.sync_db_path)
@@ -577,9 +811,6 @@ class DataManager:
         finally:
             if conn:
                 conn.close()
-        
-        # Add to sync queue
-        self.sync_queue.put(sync_status)
     
     async def start_sync_worker(self):
         """Start background sync worker"""
@@ -594,6 +825,9 @@ class DataManager:
         """Background worker for syncing data to Google Sheets"""
         while self.sync_worker_running:
             try:
+                # Sheet ID columns are fetched at most once per pass
+                self._sheet_row_index.clear()
+                
                 # Process sync queue
                 while not self.sync_queue.empty():
                     sync_status = self.sync_queue.get_nowait()
@@ -681,12 +915,12 @@ class DataManager:
             range_name = f"{worksheet_name}!A:Z"
             
             # Check if this is an update or new entry
-            existing_row = await self._find_existing_row(worksheet, entity_data.get('id', ''))
+            existing_row = await self._find_existing_row(worksheet_name, entity_data.get('id', ''))
             
             if existing_row:
                 # Update existing row
                 update_range = f"{worksheet_name}!A{existing_row}:Z{existing_row}"
-                await self.sheets_service.spreadsheets().values().update(
+                self.sheets_service.spreadsheets().values().update(
                     spreadsheetId=self.spreadsheet_id,
                     range=update_range,
                     valueInputOption='RAW',
@@ -695,13 +929,14 @@ class DataManager:
                 logger.info(f"✅ Updated {entity_type} in Google Sheets: {entity_data.get('id')}")
             else:
                 # Append new row
-                await self.sheets_service.spreadsheets().values().append(
+                response = self.sheets_service.spreadsheets().values().append(
                     spreadsheetId=self.spreadsheet_id,
                     range=range_name,
                     valueInputOption='RAW',
                     insertDataOption='INSERT_ROWS',
                     body={'values': [row_data]}
                 ).execute()
+                self._record_appended_row(worksheet_name, entity_data.get('id', ''), response)
                 logger.info(f"✅ Added {entity_type} to Google Sheets: {entity_data.get('id')}")
             
             return True
@@ -760,105 +995,108 @@ class DataManager:
     
     def _prepare_data_for_sheets(self, entity_type: str, entity_data: Dict) -> List[str]:
         """Prepare entity data for Google Sheets format"""
-        if entity_type == 'message':
-            return [
-                entity_data.get('id', ''),
-                entity_data.get('message_id', ''),
-                entity_data.get('chat_id', ''),
-                entity_data.get('chat_title', ''),
-                entity_data.get('user_id', ''),
-                entity_data.get('username', ''),
-                entity_data.get('first_name', ''),
-                entity_data.get('last_name', ''),
-                entity_data.get('message_text', ''),
-                entity_data.get('message_type', ''),
-                entity_data.get('timestamp', ''),
-                entity_data.get('sentiment_score', 0),
-                entity_data.get('keywords', ''),
-                entity_data.get('is_duplicate', False),
-                datetime.now().isoformat()
-            ]
-        elif entity_type == 'note':
-            return [
-                entity_data.get('id', ''),
-                entity_data.get('text', ''),
-                entity_data.get('timestamp', ''),
-                entity_data.get('category', ''),
-                entity_data.get('priority', ''),
-                entity_data.get('tags', ''),
-                entity_data.get('completed', False),
-                datetime.now().isoformat()
-            ]
-        elif entity_type == 'contact':
-            return [
-                entity_data.get('user_id', ''),
-                entity_data.get('username', ''),
-                entity_data.get('name', ''),
-                entity_data.get('message_count', 0),
-                entity_data.get('lead_score', 0),
-                entity_data.get('category', ''),
-                entity_data.get('company', ''),
-                entity_data.get('role', ''),
-                entity_data.get('industry', ''),
-                entity_data.get('last_message_date', ''),
-                datetime.now().isoformat()
-            ]
-        elif entity_type == 'analysis':
-            return [
-                entity_data.get('chat_id', ''),
-                entity_data.get('chat_title', ''),
-                entity_data.get('sentiment_score', 0),
-                entity_data.get('key_topics', ''),
-                entity_data.get('business_opportunities', ''),
-                entity_data.get('recommendations', ''),
-                entity_data.get('message_count', 0),
-                entity_data.get('participants', 0),
-                entity_data.get('timestamp', ''),
-                datetime.now().isoformat()
-            ]
-        else:
+        build_row = _SHEET_ROW_BUILDERS.get(entity_type)
+        if build_row is None:
             return []
+        return build_row(entity_data, datetime.now().isoformat())
     
-    async def _find_existing_row(self, worksheet, entity_id: str) -> Optional[int]:
+    async def _find_existing_row(self, worksheet_name: str, entity_id: str) -> Optional[int]:
         """Find existing row by entity ID"""
         try:
             if not entity_id:
                 return None
             
-            # Get all values from the worksheet
-            values = worksheet.get('values', [])
-            
-            # Look for the entity ID in the first column
-            for i, row in enumerate(values, 1):
-                if row and row[0] == entity_id:
-                    return i
-            
-            return None
+            return self._get_sheet_row_index(worksheet_name).get(entity_id)
             
         except Exception as e:
             logger.error(f"❌ Error finding existing row: {e}")
             return None
     
+    def _get_sheet_row_index(self, worksheet_name: str) -> Dict[str, int]:
+        """Map entity ID -> row number, fetching only the ID column once per sync pass"""
+        row_index = self._sheet_row_index.get(worksheet_name)
+        if row_index is None:
+            result = self.sheets_service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{worksheet_name}!A:A",
+                majorDimension='COLUMNS',
+                valueRenderOption='UNFORMATTED_VALUE'
+            ).execute()
+            columns = result.get('values', [])
+            ids = columns[0] if columns else []
+            row_index = {str(value): i for i, value in enumerate(ids, 1) if value != ''}
+            self._sheet_row_index[worksheet_name] = row_index
+        return row_index
+    
+    def _record_appended_row(self, worksheet_name: str, entity_id: str, response: Dict):
+        """Add an appended row to the cached ID index using the range the API reports"""
+        row_index = self._sheet_row_index.get(worksheet_name)
+        if row_index is None or not entity_id:
+            return
+        
+        updated_range = response.get('updates', {}).get('updatedRange', '')
+        match = re.search(r'![A-Z]+(\d+)', updated_range)
+        if match:
+            row_index[entity_id] = int(match.group(1))
+        else:
+            # Row position unknown - refetch the ID column on next lookup
+            del self._sheet_row_index[worksheet_name]
+    
     async def get_connection(self):
         """Get database connection for async operations"""
         return self._get_connection()
     
     async def _update_sync_status(self, sync_id: str, success: bool, error: Optional[str] = None):
-        """Update sync status in database"""
+        """Buffer a sync status update; updates are coalesced and flushed in batches"""
+        status = 'synced' if success else 'failed'
+        retry_increment = 0 if success else 1
+        attempted_at = datetime.now().isoformat()
+        
+        async with self._pending_status_lock:
+            previous = self._pending_status.get(sync_id)
+            if previous:
+                # Keep the latest outcome but count every failed attempt
+                retry_increment += previous[2]
+            self._pending_status[sync_id] = (status, error, retry_increment, attempted_at)
+            pending_count = len(self._pending_status)
+        
+        if pending_count >= self.status_flush_size:
+            await self._flush_pending_status()
+        elif self._status_flush_task is None or self._status_flush_task.done():
+            self._status_flush_task = asyncio.create_task(self._delayed_status_flush())
+    
+    async def _delayed_status_flush(self):
+        """Flush buffered sync status updates after the coalescing window"""
+        await asyncio.sleep(self.status_flush_interval)
+        await self._flush_pending_status()
+    
+    async def _flush_pending_status(self):
+        """Write all buffered sync status updates in a single transaction"""
+        async with self._pending_status_lock:
+            if not self._pending_status:
+                return
+            pending, self._pending_status = self._pending_status, {}
+        
+        rows = [
+            (status, attempted_at, error, retry_increment, attempted_at, sync_id)
+            for sync_id, (status, error, retry_increment, attempted_at) in pending.items()
+        ]
+        await asyncio.to_thread(self._write_sync_status_updates, rows)
+        self._invalidate_cache('get_sync_status')
+    
+    def _write_sync_status_updates(self, rows: List[Tuple]):
+        """Write sync attempt results to the sync tracking database"""
         conn = None
         try:
             conn = sqlite3.connect(self.sync_db_path)
             cursor = conn.cursor()
             
-            status = 'synced' if success else 'failed'
-            retry_count = 0 if success else 1
-            
-            cursor.execute('''
+            cursor.executemany('''
                 UPDATE sync_status 
                 SET sync_status = ?, last_sync_attempt = ?, sync_error = ?, 
                     retry_count = retry_count + ?, updated_at = ?
                 WHERE id = ?
-            ''', (status, datetime.now().isoformat(), error, retry_count, datetime.now().isoformat(), sync_id))
+            ''', rows)
             
             conn.commit()
             
@@ -870,6 +1108,14 @@ class DataManager:
     
     async def _retry_failed_syncs(self):
         """Retry failed syncs with exponential backoff"""
+        await self._flush_pending_status()
+        failed_syncs = await asyncio.to_thread(self._load_failed_syncs)
+        for sync_status in failed_syncs:
+            # Add back to queue for retry
+            await self.sync_queue.put(sync_status)
+    
+    def _load_failed_syncs(self) -> List[SyncStatus]:
+        """Load failed syncs that are still eligible for retry"""
         conn = None
         try:
             conn = sqlite3.connect(self.sync_db_path)
@@ -877,30 +1123,32 @@ class DataManager:
             
             # Get failed syncs that haven't been retried too many times
             cursor.execute('''
-                SELECT * FROM sync_status 
+                SELECT id, entity_type, entity_id, local_hash, remote_hash, sync_status,
+                       last_sync_attempt, sync_error, retry_count
+                FROM sync_status 
                 WHERE sync_status = 'failed' AND retry_count < 5
                 ORDER BY last_sync_attempt ASC
                 LIMIT 10
             ''')
             
-            failed_syncs = cursor.fetchall()
-            for row in failed_syncs:
-                sync_status = SyncStatus(
+            return [
+                SyncStatus(
                     id=row[0], entity_type=row[1], entity_id=row[2],
                     local_hash=row[3], remote_hash=row[4], sync_status=row[5],
                     last_sync_attempt=datetime.fromisoformat(row[6]) if row[6] else None,
                     sync_error=row[7], retry_count=row[8]
                 )
-                
-                # Add back to queue for retry
-                self.sync_queue.put(sync_status)
+                for row in cursor.fetchall()
+            ]
             
         except Exception as e:
             logger.error(f"❌ Error retrying failed syncs: {e}")
+            return []
         finally:
             if conn:
                 conn.close()
     
+    @_ttl_cached(ttl=2.0)
     def get_sync_status(self) -> Dict[str, Any]:
         """Get overall sync status"""
         conn = None
@@ -931,22 +1179,32 @@ class DataManager:
             if conn:
                 conn.close()
     
+    def _invalidate_cache(self, method_name: str):
+        """Drop cached results of a _ttl_cached method after its data changed"""
+        for key in [key for key in self.cache if key[0] == method_name]:
+            del self.cache[key]
+    
     def cleanup_cache(self):
         """Clean up expired cache entries"""
         current_time = time.time()
         if current_time - self.last_cache_cleanup > 300:  # 5 minutes
-            expired_keys = [
-                key for key, (_, timestamp) in self.cache.items()
-                if current_time - timestamp > self.cache_ttl
-            ]
-            for key in expired_keys:
-                del self.cache[key]
+            # Entries are kept oldest-first, so stop at the first fresh one
+            while self.cache:
+                _, timestamp = next(iter(self.cache.values()))
+                if current_time - timestamp <= self.cache_ttl:
+                    break
+                self.cache.popitem(last=False)
             self.last_cache_cleanup = current_time
     
     async def close(self):
         """Cleanup and close connections"""
         self.sync_worker_running = False
         
+        # Persist any buffered sync status updates
+        if self._status_flush_task and not self._status_flush_task.done():
+            self._status_flush_task.cancel()
+        await self._flush_pending_status()
+        
         # Close all connections in pool
         while not self.connection_pool.empty():
             try:
@@ -959,57 +1217,25 @@ class DataManager:
     
     async def get_contacts(self, limit: int = None) -> List[Dict]:
         """Get contacts from messages with lead scoring"""
+        conn = None
         try:
-            query = """
-                SELECT DISTINCT
-                    user_id,
-                    username,
-                    first_name,
-                    last_name,
-                    COUNT(*) as message_count,
-                    MAX(timestamp) as last_message_date,
-                    AVG(sentiment_score) as avg_sentiment,
-                    COUNT(CASE WHEN sentiment_score > 0.5 THEN 1 END) as positive_messages,
-                    COUNT(CASE WHEN sentiment_score < -0.5 THEN 1 END) as negative_messages
-                FROM messages 
-                WHERE user_id IS NOT NULL AND user_id != 0
-                GROUP BY user_id, username, first_name, last_name
-                ORDER BY message_count DESC, last_message_date DESC
-            """
+            conn = self._get_connection()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute(_CONTACTS_SQL, (limit if limit else -1,))
             
-            if limit:
-                query += f" LIMIT {limit}"
+            contacts = [dict(row) for row in cursor.fetchall()]
+            for contact in contacts:
+                contact['company'], contact['role'], contact['industry'] = _extract_all(contact['username'])
+            
+            return contacts
             
-            async with self.get_connection() as conn:
-                cursor = await conn.execute(query)
-                rows = await cursor.fetchall()
-                
-                contacts = []
-                for row in rows:
-                    contact = {
-                        'user_id': row[0],
-                        'username': row[1] or '',
-                        'first_name': row[2] or '',
-                        'last_name': row[3] or '',
-                        'name': f"{row[2] or ''} {row[3] or ''}".strip() or f"User {row[0]}",
-                        'message_count': row[4],
-                        'last_message_date': row[5],
-                        'avg_sentiment': row[6] or 0,
-                        'positive_messages': row[7],
-                        'negative_messages': row[8],
-                        'category': self._categorize_contact(row[4], row[6] or 0),
-                        'lead_score': self._calculate_lead_score(row[4], row[6] or 0, row[7], row[8]),
-                        'company': self._extract_company_info(row[1] or ''),
-                        'role': self._extract_role_info(row[1] or ''),
-                        'industry': self._extract_industry_info(row[1] or '')
-                    }
-                    contacts.append(contact)
-                
-                return contacts
-                
         except Exception as e:
             logger.error(f"❌ Error getting contacts: {e}")
             return []
+        finally:
+            if conn:
+                self._return_connection(conn)
     
     def _categorize_contact(self, message_count: int, avg_sentiment: float) -> str:
         """Categorize contact based on activity and sentiment"""
@@ -1044,63 +1270,15 @@ class DataManager:
     
     def _extract_company_info(self, username: str) -> str:
         """Extract company information from username"""
-        # Simple extraction - can be enhanced with AI
-        if '@' in username:
-            username = username.split('@')[1]
-        
-        # Common company indicators
-        company_indicators = ['corp', 'inc', 'ltd', 'co', 'tech', 'ai', 'digital', 'media']
-        for indicator in company_indicators:
-            if indicator in username.lower():
-                return username.title()
-        
-        return "N/A"
+        return _extract_all(username)[0]
     
     def _extract_role_info(self, username: str) -> str:
         """Extract role information from username"""
-        # Simple extraction - can be enhanced with AI
-        role_indicators = {
-            'ceo': 'CEO',
-            'cto': 'CTO',
-            'cfo': 'CFO',
-            'founder': 'Founder',
-            'cofounder': 'Co-Founder',
-            'manager': 'Manager',
-            'director': 'Director',
-            'lead': 'Lead',
-            'senior': 'Senior',
-            'junior': 'Junior'
-        }
-        
-        username_lower = username.lower()
-        for indicator, role in role_indicators.items():
-            if indicator in username_lower:
-                return role
-        
-        return "N/A"
+        return _extract_all(username)[1]
     
     def _extract_industry_info(self, username: str) -> str:
         """Extract industry information from username"""
-        # Simple extraction - can be enhanced with AI
-        industry_indicators = {
-            'tech': 'Technology',
-            'ai': 'Artificial Intelligence',
-            'fintech': 'Financial Technology',
-            'health': 'Healthcare',
-            'edu': 'Education',
-            'media': 'Media',
-            'marketing': 'Marketing',
-            'sales': 'Sales',
-            'consulting': 'Consulting',
-            'realestate': 'Real Estate'
-        }
-        
-        username_lower = username.lower()
-        for indicator, industry in industry_indicators.items():
-            if indicator in username_lower:
-                return industry
-        
-        return "N/A" 
+        return _extract_all(username)[2]
 
     # Add missing methods that the bot is trying to use
     async def get_recent_messages(self, days: int = 7, chat_id: Optional[int] = None, limit: int = 1000) -> List[Dict]:
@@ -1128,11 +1306,15 @@ class DataManager:
                     LIMIT ?
                 ''', (cutoff_date.isoformat(), limit))
             
+            # Stream rows in fixed-size batches rather than materializing the
+            # whole result set alongside the converted dicts
+            cursor.arraysize = 256
             messages = []
-            for row in cursor.fetchall():
-                msg_dict = dict(row)
-                msg_dict['keywords'] = self._deserialize_list(msg_dict.get('keywords', '[]'))
-                messages.append(msg_dict)
+            while batch := cursor.fetchmany():
+                for row in batch:
+                    msg_dict = dict(row)
+                    msg_dict['keywords'] = self._deserialize_list(row['keywords'])
+                    messages.append(msg_dict)
             
             return messages
             
@@ -1143,6 +1325,7 @@ class DataManager:
             if conn:
                 self._return_connection(conn)
     
+    @_ttl_cached(ttl=2.0)
     def get_chat_list(self, limit: int = 50) -> List[Dict]:
         """Get list of chats with message counts"""
         conn = None
@@ -1183,7 +1366,7 @@ class DataManager:
             return []
         finally:
             if conn:
-                conn.close()
+                self._return_connection(conn)
     
     def get_last_message_timestamp(self, chat_id: int) -> Optional[datetime]:
         """Get the timestamp of the last message in a chat"""
@@ -1207,7 +1390,7 @@ class DataManager:
             return None
         finally:
             if conn:
-                conn.close()
+                self._return_connection(conn)
     
     def store_message(self, message_data: Dict[str, Any]) -> bool:
         """Store a message (synchronous version for compatibility)"""
@@ -1220,19 +1403,16 @@ class DataManager:
             content = f"{message_data.get('message_text', '')}{message_data.get('timestamp', '')}"
             content_hash = self._generate_hash(content)
             
+            # One timestamp shared by the message and contact writes
+            now = datetime.now().isoformat()
+            
             conn = self._get_connection()
             cursor = conn.cursor()
             
             # Create message ID
             message_id = f"msg_{message_data.get('message_id', 0)}_{message_data.get('chat_id', 0)}"
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO messages (
-                    id, message_id, chat_id, chat_title, user_id, username, first_name, last_name,
-                    message_text, message_type, timestamp, content_hash, sentiment_score,
-                    keywords, is_duplicate, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            cursor.execute(_INSERT_MSG_SQL, (
                 message_id,
                 message_data.get('message_id', 0),
                 message_data.get('chat_id', 0),
@@ -1248,14 +1428,15 @@ class DataManager:
                 0.0,  # sentiment_score
                 '[]',  # keywords
                 False,  # is_duplicate
-                datetime.now().isoformat()
+                now
             ))
             
             conn.commit()
             self._return_connection(conn)
+            self._invalidate_cache('get_chat_list')
             
             # Also store/update contact information
-            self._store_contact_from_message(message_data)
+            self._store_contact_from_message(message_data, now)
             
             return True
             
@@ -1263,7 +1444,7 @@ class DataManager:
             logger.error(f"❌ Error storing message: {e}")
             return False
     
-    def _store_contact_from_message(self, message_data: Dict[str, Any]):
+    def _store_contact_from_message(self, message_data: Dict[str, Any], now: Optional[str] = None):
         """Extract and store contact information from message"""
         try:
             user_id = message_data.get('user_id')
@@ -1273,50 +1454,19 @@ class DataManager:
             conn = self._get_connection()
             cursor = conn.cursor()
             
-            # Check if contact exists
-            cursor.execute('SELECT id FROM contacts WHERE id = ?', (str(user_id),))
-            exists = cursor.fetchone()
-            
             name = f"{message_data.get('first_name', '')} {message_data.get('last_name', '')}".strip()
             if not name:
                 name = message_data.get('username', f'User {user_id}')
             
-            if exists:
-                # Update existing contact
-                cursor.execute('''
-                    UPDATE contacts SET
-                        name = ?,
-                        username = ?,
-                        message_count = message_count + 1,
-                        last_message_date = ?,
-                        updated_at = ?
-                    WHERE id = ?
-                ''', (
-                    name,
-                    message_data.get('username', ''),
-                    message_data.get('timestamp', ''),
-                    datetime.now().isoformat(),
-                    str(user_id)
-                ))
-            else:
-                # Create new contact
-                cursor.execute('''
-                    INSERT INTO contacts (
-                        id, name, username, category, priority, message_count,
-                        last_message_date, lead_score, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    str(user_id),
-                    name,
-                    message_data.get('username', ''),
-                    'contact',
-                    1,
-                    1,
-                    message_data.get('timestamp', ''),
-                    0.0,
-                    datetime.now().isoformat(),
-                    datetime.now().isoformat()
-                ))
+            now = now or datetime.now().isoformat()
+            cursor.execute(_UPSERT_CONTACT_SQL, (
+                str(user_id),
+                name,
+                message_data.get('username', ''),
+                message_data.get('timestamp', ''),
+                now,
+                now
+            ))
             
             conn.commit()
             self._return_connection(conn)
@@ -12,24 +12,95 @@ Command handlers for database operations including:
 
 import logging
 import asyncio
+import bisect
+import csv
 import json
+import os
+import sqlite3
+import threading
+import time
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
+from queue import Queue, Empty, Full
 import click
 
+# Faster JSON encoding for exports
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .local_database_manager import LocalDatabaseManager, get_local_db_manager
 from .sheets_sync_manager import SheetsyncManager, get_sheets_sync_manager
 
 logger = logging.getLogger(__name__)
 
+# Tables included in file exports, in output order
+EXPORT_TABLES = ('contacts', 'organizations', 'interactions', 'leads', 'messages', 'chat_groups')
+EXPORT_FORMATS = {'csv': 'csv', 'excel': 'xlsx', 'json': 'json'}  # format -> file extension
+# Larger tables are refused for Excel (sheet limit is 1,048,576 rows); CSV handles them
+EXCEL_MAX_ROWS = 1_000_000
+# Per-directory record of the last export of each table, used to skip unchanged tables
+EXPORT_STATE_FILE = '.export_state.json'
+
+# Database health rules: (stats key, trigger, score penalty, issue template, recommendation)
+HEALTH_RULES = (
+    ('total_contacts', lambda n: n == 0, lambda n: 30,
+     "No contacts in database", "Import Telegram data or add contacts manually"),
+    ('total_interactions', lambda n: n == 0, lambda n: 20,
+     "No interactions recorded", "Import message history or log interactions"),
+    ('sync_failed', lambda n: n > 0, lambda n: min(30, n * 5),
+     "{} failed syncs", "Review and retry failed syncs"),
+    ('follow_ups_needed', lambda n: n > 10, lambda n: 10,
+     "{} contacts need follow-up", "Schedule follow-ups for overdue contacts"),
+    ('database_size_mb', lambda n: n > 500, lambda n: 5,  # 500MB threshold
+     "Large database size", "Consider archiving old data"),
+)
+# Column -> whole-column transform applied to CSV imports (columns are read as text)
+CONTACT_CSV_SCHEMA = {
+    'first_name': lambda col: col.str.strip(),
+    'last_name': lambda col: col.str.strip(),
+    'username': lambda col: col.str.strip().str.lstrip('@'),
+    'email': lambda col: col.str.strip().str.lower(),
+    'phone': lambda col: col.str.replace(r'[^\d+]', '', regex=True),
+    'lead_score': lambda col: pd.to_numeric(col, errors='coerce'),
+    'estimated_value': lambda col: pd.to_numeric(col, errors='coerce'),
+    'probability': lambda col: pd.to_numeric(col, errors='coerce'),
+}
+CSV_IMPORT_SCHEMAS = {'contacts': CONTACT_CSV_SCHEMA}
+
+# Scores below 50 are poor, 50-74 fair, 75-89 good, 90+ excellent
+HEALTH_LEVEL_THRESHOLDS = (50, 75, 90)
+HEALTH_LEVELS = ('poor', 'fair', 'good', 'excellent')
+
+def _dump_json_record(record: Dict) -> bytes:
+    """Encode one exported record as indented UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(record, indent=2, default=str).encode('utf-8')
+
 class DatabaseCommands:
     """Database management command handlers"""
     
     def __init__(self):
         self.db_manager = None
         self.sync_manager = None
+        self.bulk_insert_chunk_size = 10_000  # rows per executemany/commit
+        self.export_chunk_size = 50_000  # rows held in memory per table during export
+        self.csv_export_batch_size = 10_000  # cursor rows per csv.writer.writerows call
+        # create_backup_sync temporarily swaps the sync manager's spreadsheet, so
+        # Sheets work from concurrently running commands must not interleave
+        self._sheets_lock = asyncio.Lock()
+        self._sync_status_cache = None  # (timestamp, status)
+        self.sync_status_ttl = 5  # seconds
+        self.vacuum_free_ratio = 0.1  # full VACUUM only above this freelist/page_count ratio
+        # Export/status reads share a small pool; imports and compaction use the single writer
+        self.read_pool = Queue(maxsize=4)
+        self._writer = None
+        self._writer_lock = threading.Lock()
     
     async def _init_managers(self):
         """Initialize database and sync managers"""
@@ -38,16 +109,77 @@ class DatabaseCommands:
         if not self.sync_manager:
             self.sync_manager = get_sheets_sync_manager()
     
-    async def database_status(self) -> Dict[str, Any]:
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a tuned connection; WAL lets the readers run alongside the writer"""
+        conn = sqlite3.connect(self.db_manager.db_path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')  # 256MB
+        conn.execute('PRAGMA cache_size=-65536')  # 64MB
+        return conn
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get a read connection from the pool"""
+        try:
+            return self.read_pool.get_nowait()
+        except Empty:
+            return self._open_connection()
+    
+    def _return_connection(self, conn: sqlite3.Connection):
+        """Return a read connection to the pool"""
+        try:
+            self.read_pool.put_nowait(conn)
+        except Full:
+            conn.close()
+    
+    def _acquire_writer(self) -> sqlite3.Connection:
+        """Take the single write connection; pair with _release_writer"""
+        self._writer_lock.acquire()
+        try:
+            if self._writer is None:
+                self._writer = self._open_connection()
+            return self._writer
+        except Exception:
+            self._writer_lock.release()
+            raise
+    
+    def _release_writer(self):
+        """Release the write connection, discarding any uncommitted work"""
+        try:
+            if self._writer is not None:
+                self._writer.rollback()
+        finally:
+            self._writer_lock.release()
+    
+    async def _cached_sync_status(self) -> Dict[str, Any]:
+        """Sync manager status, fetched at most once per TTL window"""
+        now = time.monotonic()
+        if self._sync_status_cache and now - self._sync_status_cache[0] < self.sync_status_ttl:
+            return self._sync_status_cache[1]
+        
+        # Fetching worksheet metadata is a blocking HTTP round trip
+        status = await asyncio.to_thread(self.sync_manager.get_sync_status)
+        self._sync_status_cache = (now, status)
+        return status
+    
+    async def database_status(self, stats: Dict = None) -> Dict[str, Any]:
         """Get comprehensive database status"""
         try:
             await self._init_managers()
             
-            # Get database statistics
-            stats = await self.db_manager.get_database_stats()
+            async def locked_sync_status():
+                async with self._sheets_lock:
+                    return await self._cached_sync_status()
             
-            # Get sync status
-            sync_status = self.sync_manager.get_sync_status()
+            # Database statistics (callers that already hold them pass them in) and the
+            # Sheets status are independent, so overlap the SQLite scans with the HTTP call
+            if stats is None:
+                stats, sync_status = await asyncio.gather(
+                    self.db_manager.get_database_stats(), locked_sync_status()
+                )
+            else:
+                sync_status = await locked_sync_status()
             
             status = {
                 "database": {
@@ -91,83 +223,50 @@ class DatabaseCommands:
     
     def _assess_database_health(self, stats: Dict) -> Dict[str, Any]:
         """Assess overall database health"""
-        health = {
-            "score": 100,
-            "issues": [],
-            "recommendations": []
-        }
-        
-        # Check for data completeness
-        if stats.get('total_contacts', 0) == 0:
-            health["score"] -= 30
-            health["issues"].append("No contacts in database")
-            health["recommendations"].append("Import Telegram data or add contacts manually")
-        
-        if stats.get('total_interactions', 0) == 0:
-            health["score"] -= 20
-            health["issues"].append("No interactions recorded")
-            health["recommendations"].append("Import message history or log interactions")
-        
-        # Check sync health
-        failed_syncs = stats.get('sync_failed', 0)
-        if failed_syncs > 0:
-            health["score"] -= min(30, failed_syncs * 5)
-            health["issues"].append(f"{failed_syncs} failed syncs")
-            health["recommendations"].append("Review and retry failed syncs")
-        
-        # Check follow-up management
-        follow_ups_needed = stats.get('follow_ups_needed', 0)
-        if follow_ups_needed > 10:
-            health["score"] -= 10
-            health["issues"].append(f"{follow_ups_needed} contacts need follow-up")
-            health["recommendations"].append("Schedule follow-ups for overdue contacts")
+        score = 100
+        issues = []
+        recommendations = []
+        for key, triggered, penalty, issue, recommendation in HEALTH_RULES:
+            value = stats.get(key, 0)
+            if triggered(value):
+                score -= penalty(value)
+                issues.append(issue.format(value))
+                recommendations.append(recommendation)
         
-        # Database size check
-        db_size = stats.get('database_size_mb', 0)
-        if db_size > 500:  # 500MB threshold
-            health["score"] -= 5
-            health["issues"].append("Large database size")
-            health["recommendations"].append("Consider archiving old data")
-        
-        # Determine health level
-        if health["score"] >= 90:
-            health["level"] = "excellent"
-        elif health["score"] >= 75:
-            health["level"] = "good"
-        elif health["score"] >= 50:
-            health["level"] = "fair"
-        else:
-            health["level"] = "poor"
-        
-        return health
+        return {
+            "score": score,
+            "issues": issues,
+            "recommendations": recommendations,
+            "level": HEALTH_LEVELS[bisect.bisect_right(HEALTH_LEVEL_THRESHOLDS, score)]
+        }
     
     async def import_telegram_data(self, source_path: str = None) -> Dict[str, Any]:
         """Import data from Telegram database"""
         try:
             await self._init_managers()
             
-            print("🔄 Starting Telegram data import...")
+            logger.info("🔄 Starting Telegram data import...")
             
             result = await self.db_manager.import_telegram_data(source_path)
             
             if result.get("success"):
                 stats = result.get("stats", {})
-                print("✅ Telegram import completed successfully!")
-                print(f"   📥 Messages imported: {stats.get('messages_imported', 0)}")
-                print(f"   👥 Contacts created: {stats.get('contacts_created', 0)}")
-                print(f"   💬 Interactions created: {stats.get('interactions_created', 0)}")
+                logger.info("✅ Telegram import completed successfully!")
+                logger.info(f"   📥 Messages imported: {stats.get('messages_imported', 0)}")
+                logger.info(f"   👥 Contacts created: {stats.get('contacts_created', 0)}")
+                logger.info(f"   💬 Interactions created: {stats.get('interactions_created', 0)}")
                 
                 # Automatically sync to Google Sheets if configured
-                if self.sync_manager.get_sync_status().get('google_sheets_configured'):
-                    print("\n🔄 Syncing imported data to Google Sheets...")
+                if (await self._cached_sync_status()).get('google_sheets_configured'):
+                    logger.info("🔄 Syncing imported data to Google Sheets...")
                     sync_result = await self.sync_manager.incremental_sync(self.db_manager)
                     if sync_result.get("success"):
-                        print(f"✅ Synced {sync_result.get('records_synced', 0)} records to Google Sheets")
+                        logger.info(f"✅ Synced {sync_result.get('records_synced', 0)} records to Google Sheets")
                     else:
-                        print(f"⚠️ Sync failed: {sync_result.get('error')}")
+                        logger.warning(f"⚠️ Sync failed: {sync_result.get('error')}")
                 
             else:
-                print(f"❌ Import failed: {result.get('error')}")
+                logger.error(f"❌ Import failed: {result.get('error')}")
             
             return result
             
@@ -180,22 +279,23 @@ class DatabaseCommands:
         try:
             await self._init_managers()
             
-            print("💾 Creating database backup...")
+            logger.info("💾 Creating database backup...")
             
             backup_file = await self.db_manager.backup_database(backup_path)
             
-            print(f"✅ Database backup created: {backup_file}")
+            logger.info(f"✅ Database backup created: {backup_file}")
             
             # Also create Google Sheets backup if configured
-            if self.sync_manager.get_sync_status().get('google_sheets_configured'):
-                print("🔄 Creating Google Sheets backup...")
-                backup_result = await self.sync_manager.create_backup_sync()
-                
-                if backup_result.get("success"):
-                    print(f"✅ Google Sheets backup created: {backup_result.get('backup_title')}")
-                    print(f"   📊 Backup Spreadsheet ID: {backup_result.get('backup_spreadsheet_id')}")
-                else:
-                    print(f"⚠️ Google Sheets backup failed: {backup_result.get('error')}")
+            async with self._sheets_lock:
+                if (await self._cached_sync_status()).get('google_sheets_configured'):
+                    logger.info("🔄 Creating Google Sheets backup...")
+                    backup_result = await self.sync_manager.create_backup_sync()
+                    
+                    if backup_result.get("success"):
+                        logger.info(f"✅ Google Sheets backup created: {backup_result.get('backup_title')}")
+                        logger.info(f"   📊 Backup Spreadsheet ID: {backup_result.get('backup_spreadsheet_id')}")
+                    else:
+                        logger.warning(f"⚠️ Google Sheets backup failed: {backup_result.get('error')}")
             
             return {
                 "success": True,
@@ -212,33 +312,34 @@ class DatabaseCommands:
         try:
             await self._init_managers()
             
-            if not self.sync_manager.get_sync_status().get('google_sheets_configured'):
+            if not (await self._cached_sync_status()).get('google_sheets_configured'):
                 return {"success": False, "error": "Google Sheets not configured"}
             
-            if full_sync:
-                print("🔄 Starting full sync to Google Sheets...")
-                result = await self.sync_manager.full_sync(self.db_manager)
-            else:
-                print("🔄 Starting incremental sync to Google Sheets...")
-                result = await self.sync_manager.incremental_sync(self.db_manager)
+            async with self._sheets_lock:
+                if full_sync:
+                    logger.info("🔄 Starting full sync to Google Sheets...")
+                    result = await self.sync_manager.full_sync(self.db_manager)
+                else:
+                    logger.info("🔄 Starting incremental sync to Google Sheets...")
+                    result = await self.sync_manager.incremental_sync(self.db_manager)
             
             if result.get("success"):
-                print("✅ Sync completed successfully!")
-                print(f"   📊 Records synced: {result.get('records_synced', result.get('total_records', 0))}")
+                logger.info("✅ Sync completed successfully!")
+                logger.info(f"   📊 Records synced: {result.get('records_synced', result.get('total_records', 0))}")
                 
                 if 'tables_synced' in result:
-                    print("   📋 Tables synced:")
+                    logger.info("   📋 Tables synced:")
                     for table, table_result in result['tables_synced'].items():
                         if table_result.get('success'):
-                            print(f"      ✅ {table}: {table_result.get('records_synced', 0)} records")
+                            logger.info(f"      ✅ {table}: {table_result.get('records_synced', 0)} records")
                         else:
-                            print(f"      ❌ {table}: {table_result.get('error', 'Unknown error')}")
+                            logger.warning(f"      ❌ {table}: {table_result.get('error', 'Unknown error')}")
                 
             else:
-                print(f"❌ Sync failed: {result.get('error')}")
+                logger.error(f"❌ Sync failed: {result.get('error')}")
                 if result.get('errors'):
                     for error in result['errors']:
-                        print(f"   🔸 {error}")
+                        logger.error(f"   🔸 {error}")
             
             return result
             
@@ -246,19 +347,20 @@ class DatabaseCommands:
             logger.error(f"❌ Sync error: {e}")
             return {"success": False, "error": str(e)}
     
-    async def optimize_database(self) -> Dict[str, Any]:
+    async def optimize_database(self, stats_before: Dict = None) -> Dict[str, Any]:
         """Optimize database performance"""
         try:
             await self._init_managers()
             
-            print("🔧 Optimizing database...")
+            logger.info("🔧 Optimizing database...")
             
             # Get stats before optimization
-            stats_before = await self.db_manager.get_database_stats()
+            if stats_before is None:
+                stats_before = await self.db_manager.get_database_stats()
             size_before = stats_before.get('database_size_mb', 0)
             
-            # Vacuum database
-            await self.db_manager.vacuum_database()
+            # Rewriting the whole file is only worth it when it is badly fragmented
+            mode = await asyncio.to_thread(self._compact_database)
             
             # Get stats after optimization
             stats_after = await self.db_manager.get_database_stats()
@@ -266,13 +368,15 @@ class DatabaseCommands:
             
             size_saved = size_before - size_after
             
-            print("✅ Database optimization completed!")
-            print(f"   💾 Size before: {size_before:.2f} MB")
-            print(f"   💾 Size after: {size_after:.2f} MB")
-            print(f"   💾 Space saved: {size_saved:.2f} MB")
+            logger.info("✅ Database optimization completed!")
+            logger.info(f"   💾 Size before: {size_before:.2f} MB")
+            logger.info(f"   💾 Size after: {size_after:.2f} MB")
+            logger.info(f"   💾 Space saved: {size_saved:.2f} MB")
+            logger.info(f"   🔧 Mode: {mode}")
             
             return {
                 "success": True,
+                "mode": mode,
                 "size_before_mb": size_before,
                 "size_after_mb": size_after,
                 "space_saved_mb": size_saved
@@ -282,49 +386,99 @@ class DatabaseCommands:
             logger.error(f"❌ Optimization error: {e}")
             return {"success": False, "error": str(e)}
     
+    def _compact_database(self) -> str:
+        """Compact the database as cheaply as possible; returns 'checkpoint', 'incremental' or 'vacuum'"""
+        conn = self._acquire_writer()
+        try:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            
+            if not page_count or freelist_count / page_count < self.vacuum_free_ratio:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                return "checkpoint"
+            
+            # auto_vacuum: 0 = none, 1 = full, 2 = incremental
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                conn.executescript("PRAGMA incremental_vacuum;")  # execute() would free only one page
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                return "incremental"
+            
+            # Only persisted by a VACUUM on this same connection; later runs can go incremental
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            return "vacuum"
+        finally:
+            self._release_writer()
+    
     async def export_data(self, format: str = "csv", output_dir: str = "exports") -> Dict[str, Any]:
         """Export database data to files"""
         try:
             await self._init_managers()
             
+            format = format.lower()
+            if format not in EXPORT_FORMATS:
+                return {"success": False, "error": f"Unsupported format: {format}"}
+            
             output_path = Path(output_dir)
             output_path.mkdir(exist_ok=True)
             
-            print(f"📤 Exporting database to {format.upper()} format...")
+            logger.info(f"📤 Exporting database to {format.upper()} format...")
             
-            # Get all data
-            dataframes = await self.db_manager.export_to_dataframes()
+            tables = await asyncio.to_thread(self._get_export_tables)
             
-            if not dataframes:
+            if not tables:
                 return {"success": False, "error": "No data to export"}
             
             exported_files = []
+            skipped_unchanged = []
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            for table_name, df in dataframes.items():
-                if df.empty:
-                    continue
-                
-                filename = f"{table_name}_{timestamp}.{format}"
+            state_path = output_path / EXPORT_STATE_FILE
+            export_state = json.loads(state_path.read_text()) if state_path.exists() else {}
+            
+            # Tables are streamed chunk by chunk so memory stays O(chunk), not O(table)
+            if format == "excel":
+                for table_name in tables:
+                    row_count = await asyncio.to_thread(self._count_table_rows, table_name)
+                    if row_count > EXCEL_MAX_ROWS:
+                        return {"success": False, "error": f"{table_name} has {row_count} rows - use csv for tables >1M rows"}
+            
+            for table_name in tables:
+                filename = f"{table_name}_{timestamp}.{EXPORT_FORMATS[format]}"
                 file_path = output_path / filename
+                state_key = f"{format}:{table_name}"
                 
-                if format.lower() == "csv":
-                    df.to_csv(file_path, index=False)
-                elif format.lower() == "excel":
-                    df.to_excel(file_path, index=False)
-                elif format.lower() == "json":
-                    df.to_json(file_path, orient='records', indent=2)
-                else:
-                    return {"success": False, "error": f"Unsupported format: {format}"}
+                # Unchanged since the last export: hardlink the previous file instead of rewriting it
+                watermark = await asyncio.to_thread(self._table_watermark, table_name)
+                previous = export_state.get(state_key)
+                if watermark is not None and previous and previous["watermark"] == watermark:
+                    previous_path = output_path / previous["file"]
+                    if previous_path.exists():
+                        if previous_path != file_path:
+                            file_path.unlink(missing_ok=True)
+                            os.link(previous_path, file_path)
+                        previous["file"] = filename
+                        exported_files.append(str(file_path))
+                        skipped_unchanged.append(table_name)
+                        logger.info(f"   ⏭️ {table_name}: unchanged → {filename}")
+                        continue
                 
+                record_count = await asyncio.to_thread(self._export_table, table_name, format, file_path)
+                if record_count == 0:
+                    continue
+                
+                export_state[state_key] = {"watermark": watermark, "file": filename}
                 exported_files.append(str(file_path))
-                print(f"   ✅ {table_name}: {len(df)} records → {filename}")
+                logger.info(f"   ✅ {table_name}: {record_count} records → {filename}")
+            
+            state_path.write_text(json.dumps(export_state, indent=2))
             
-            print(f"✅ Export completed! Files saved to: {output_path}")
+            logger.info(f"✅ Export completed! Files saved to: {output_path}")
             
             return {
                 "success": True,
                 "exported_files": exported_files,
+                "skipped_unchanged": skipped_unchanged,
                 "output_directory": str(output_path),
                 "total_files": len(exported_files)
             }
@@ -333,8 +487,115 @@ class DatabaseCommands:
             logger.error(f"❌ Export error: {e}")
             return {"success": False, "error": str(e)}
     
+    def _get_export_tables(self) -> List[str]:
+        """List the exportable tables present in the database"""
+        conn = self._get_connection()
+        try:
+            existing = {
+                row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+            return [table for table in EXPORT_TABLES if table in existing]
+        finally:
+            self._return_connection(conn)
+    
+    def _table_watermark(self, table_name: str) -> Optional[List[Any]]:
+        """[row count, MAX(updated_at)] change marker, or None for tables without updated_at"""
+        conn = self._get_connection()
+        try:
+            columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')}
+            if 'updated_at' not in columns:
+                return None
+            # The count catches deletes, which leave MAX(updated_at) untouched
+            return list(conn.execute(f'SELECT COUNT(*), MAX(updated_at) FROM "{table_name}"').fetchone())
+        finally:
+            self._return_connection(conn)
+    
+    def _count_table_rows(self, table_name: str) -> int:
+        """Row count for an export table"""
+        conn = self._get_connection()
+        try:
+            return conn.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()[0]
+        finally:
+            self._return_connection(conn)
+    
+    def _export_table(self, table_name: str, format: str, file_path: Path) -> int:
+        """Stream one table to disk in chunks; returns the number of records written"""
+        if format == "csv":
+            return self._export_table_csv(table_name, file_path)
+        
+        conn = self._get_connection()
+        record_count = 0
+        handle = None
+        try:
+            chunks = pd.read_sql_query(
+                f'SELECT * FROM "{table_name}"', conn, chunksize=self.export_chunk_size
+            )
+            for chunk_df in chunks:
+                if chunk_df.empty:
+                    continue
+                
+                # Open the output lazily so empty tables produce no file
+                if handle is None:
+                    if format == "excel":
+                        # No xlsxwriter constant_memory: to_excel writes cells column by column,
+                        # which that mode cannot handle (it flushes rows as soon as a later row starts)
+                        handle = pd.ExcelWriter(file_path, engine='xlsxwriter')
+                    elif format == "json":
+                        handle = open(file_path, 'wb')
+                        handle.write(b'[')
+                
+                if format == "excel":
+                    chunk_df.to_excel(
+                        handle, sheet_name=table_name[:31], index=False,
+                        header=record_count == 0, startrow=record_count + 1 if record_count else 0
+                    )
+                elif format == "json":
+                    records = chunk_df.astype(object).where(pd.notna(chunk_df), None).to_dict(orient='records')
+                    for record in records:
+                        handle.write(b',\n' if record_count else b'\n')
+                        handle.write(_dump_json_record(record))
+                        record_count += 1
+                    continue
+                
+                record_count += len(chunk_df)
+            
+            if handle is not None and format == "json":
+                handle.write(b'\n]')
+            
+            return record_count
+        finally:
+            if handle is not None:
+                handle.close()
+            self._return_connection(conn)
+    
+    def _export_table_csv(self, table_name: str, file_path: Path) -> int:
+        """Write one table straight from the cursor with csv.writer - no DataFrame needed"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(f'SELECT * FROM "{table_name}"')
+            batch = cursor.fetchmany(self.csv_export_batch_size)
+            if not batch:
+                return 0
+            
+            record_count = 0
+            with open(file_path, 'w', newline='', encoding='utf-8') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(column[0] for column in cursor.description)
+                while batch:
+                    writer.writerows(batch)
+                    record_count += len(batch)
+                    batch = cursor.fetchmany(self.csv_export_batch_size)
+            
+            return record_count
+        finally:
+            self._return_connection(conn)
+    
     async def import_csv_data(self, csv_file: str, table_name: str) -> Dict[str, Any]:
-        """Import data from CSV file"""
+        """Import data from CSV file
+        
+        Rows are written straight to the table and are not queued for Google Sheets sync;
+        run a full sync (sync_to_sheets(full_sync=True)) to push them to the spreadsheet.
+        """
         try:
             await self._init_managers()
             
@@ -342,27 +603,28 @@ class DatabaseCommands:
             if not csv_path.exists():
                 return {"success": False, "error": f"CSV file not found: {csv_file}"}
             
-            print(f"📥 Importing CSV data to {table_name} table...")
+            logger.info(f"📥 Importing CSV data to {table_name} table...")
             
-            # Read CSV
-            df = pd.read_csv(csv_path)
+            # Read CSV - schema'd tables are read as text so e.g. phone numbers keep their digits
+            schema = CSV_IMPORT_SCHEMAS.get(table_name)
+            df = pd.read_csv(csv_path, dtype=str if schema else None)
             
             if df.empty:
                 return {"success": False, "error": "CSV file is empty"}
             
-            print(f"   📄 Found {len(df)} records in CSV")
+            logger.info(f"   📄 Found {len(df)} records in CSV")
             
-            # Import based on table type
-            imported_count = 0
+            # Normalize headers and missing values on whole columns, then bulk insert
+            df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
+            for column, transform in (schema or {}).items():
+                if column in df.columns:
+                    df[column] = transform(df[column])
+            df = df.astype(object).where(pd.notna(df), None)
+            records = df.to_dict(orient='records')
             
-            if table_name == "contacts":
-                for _, row in df.iterrows():
-                    # Convert row to Contact object and add to database
-                    # This would need proper validation and mapping
-                    pass  # Implementation depends on CSV structure
+            imported_count = await asyncio.to_thread(self._bulk_insert, table_name, records)
             
-            # Mark all imports for sync
-            print(f"✅ Imported {imported_count} records from CSV")
+            logger.info(f"✅ Imported {imported_count} records from CSV")
             
             return {
                 "success": True,
@@ -374,6 +636,49 @@ class DatabaseCommands:
             logger.error(f"❌ CSV import error: {e}")
             return {"success": False, "error": str(e)}
     
+    def _bulk_insert(self, table_name: str, records: List[Dict[str, Any]], chunk_size: int = None) -> int:
+        """Insert records with one executemany and commit per chunk; returns rows inserted"""
+        if not records:
+            return 0
+        
+        chunk_size = chunk_size or self.bulk_insert_chunk_size
+        conn = self._acquire_writer()
+        try:
+            table_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+            ).fetchone()
+            if not table_exists:
+                raise ValueError(f"Unknown table: {table_name}")
+            
+            # Only insert columns the table actually has
+            table_columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')}
+            columns = [col for col in records[0] if col in table_columns]
+            if not columns:
+                raise ValueError(f"No CSV columns match the {table_name} table")
+            
+            # Timestamp columns the CSV leaves out or empty are stamped with the import time
+            # (export_data's change marker reads MAX(updated_at))
+            now = datetime.now().isoformat()
+            stamped = [col for col in ('created_at', 'updated_at') if col in table_columns]
+            columns += [col for col in stamped if col not in columns]
+            
+            column_list = ', '.join(f'"{col}"' for col in columns)
+            placeholders = ', '.join('?' for _ in columns)
+            sql = f'INSERT OR IGNORE INTO "{table_name}" ({column_list}) VALUES ({placeholders})'
+            
+            def row(record):
+                return tuple(record.get(col) or now if col in stamped else record[col] for col in columns)
+            
+            changes_before = conn.total_changes
+            for start in range(0, len(records), chunk_size):
+                chunk = records[start:start + chunk_size]
+                conn.executemany(sql, [row(record) for record in chunk])
+                conn.commit()
+            
+            return conn.total_changes - changes_before
+        finally:
+            self._release_writer()
+    
     async def manage_contacts(self, action: str, **kwargs) -> Dict[str, Any]:
         """Manage contacts (add, update, search, delete)"""
         try:
@@ -386,15 +691,15 @@ class DatabaseCommands:
                 
                 contacts = await self.db_manager.search_contacts(query, filters, limit)
                 
-                print(f"🔍 Found {len(contacts)} contacts")
+                logger.info(f"🔍 Found {len(contacts)} contacts")
                 for contact in contacts[:10]:  # Show first 10
                     name = f"{contact.get('first_name', '')} {contact.get('last_name', '')}".strip()
                     username = contact.get('username', '')
                     score = contact.get('lead_score', 0)
-                    print(f"   👤 {name} (@{username}) - Score: {score}")
+                    logger.info(f"   👤 {name} (@{username}) - Score: {score}")
                 
                 if len(contacts) > 10:
-                    print(f"   ... and {len(contacts) - 10} more")
+                    logger.info(f"   ... and {len(contacts) - 10} more")
                 
                 return {"success": True, "contacts": contacts, "count": len(contacts)}
             
@@ -423,31 +728,34 @@ class DatabaseCommands:
         try:
             await self._init_managers()
             
-            print("🔧 Running database maintenance...")
+            logger.info("🔧 Running database maintenance...")
             
             maintenance_results = {}
             
-            # 1. Create backup
-            print("\n1️⃣ Creating backup...")
-            backup_result = await self.backup_database()
+            # One stats read shared by the health check and optimization
+            stats = await self.db_manager.get_database_stats()
+            
+            # 1. Create backup and take the health snapshot concurrently - both are
+            # I/O-bound reads of disjoint resources
+            logger.info("1️⃣ Creating backup and running health check...")
+            backup_result, status_result = await asyncio.gather(
+                self.backup_database(),
+                self.database_status(stats)
+            )
             maintenance_results['backup'] = backup_result
+            maintenance_results['health_check'] = status_result
             
-            # 2. Optimize database
-            print("\n2️⃣ Optimizing database...")
-            optimize_result = await self.optimize_database()
+            # 2. Optimize database - VACUUM needs exclusive access, so it runs alone
+            logger.info("2️⃣ Optimizing database...")
+            optimize_result = await self.optimize_database(stats_before=stats)
             maintenance_results['optimization'] = optimize_result
             
             # 3. Sync pending changes
-            print("\n3️⃣ Syncing pending changes...")
+            logger.info("3️⃣ Syncing pending changes...")
             sync_result = await self.sync_to_sheets(full_sync=False)
             maintenance_results['sync'] = sync_result
             
-            # 4. Health check
-            print("\n4️⃣ Running health check...")
-            status_result = await self.database_status()
-            maintenance_results['health_check'] = status_result
-            
-            print("\n✅ Maintenance completed!")
+            logger.info("✅ Maintenance completed!")
             
             return {
                 "success": True,
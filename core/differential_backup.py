@@ -14,17 +14,93 @@ import asyncio
 import json
 import hashlib
 import zipfile
+import zlib
 import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, Set
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Set
+from dataclasses import dataclass, asdict, fields, is_dataclass
+from functools import lru_cache
 import logging
+import math
 import os
+import sqlite3
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Fast non-cryptographic hashing for change detection
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Faster JSON encoding for change logs
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB reads amortize syscalls
+
+# Chunk store for deduplicated full backups. SQLite rewrites pages in place (page sizes
+# are powers of two up to 64 KiB), so fixed, page-aligned chunks dedup unchanged pages
+# without content-defined chunking
+DEDUP_CHUNK_SIZE = 1 << 20
+DB_RECIPE_NAME = "telegram_manager.db.chunks.json"
+
+# zstd beats DEFLATE on both speed and ratio; zipfile supports it from Python 3.14
+DEFAULT_COMPRESSION_METHOD = getattr(zipfile, 'ZIP_ZSTANDARD', zipfile.ZIP_DEFLATED)
+
+# Files whose leading bytes are this close to random (max 8 bits/byte) are stored, not deflated
+ENTROPY_SAMPLE_SIZE = 64 * 1024
+STORE_ENTROPY_THRESHOLD = 7.5
+
+# JSON compresses well at any level, so the cheapest DEFLATE level is used for it
+JSON_COMPRESSION_LEVEL = 1
+
+# Backup index, history and sync targets live in one SQLite file under metadata/
+STATE_DB_NAME = "state.db"
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+def _json_default(obj: Any) -> Any:
+    """Encode dataclasses and datetimes (orjson handles both natively)"""
+    if is_dataclass(obj):
+        return asdict(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+def _dump_json(data: Any) -> bytes:
+    """Compact UTF-8 JSON encoding"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_json_default)
+    return json.dumps(data, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+def _fast_copy(source_path: Path, target_path: Path):
+    """Copy a file in-kernel with copy_file_range (reflink on CoW filesystems), keeping its stat info"""
+    try:
+        with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except (AttributeError, OSError):
+        # No copy_file_range (non-Linux, older kernel, cross-filesystem on some kernels):
+        # shutil still copies via sendfile where it can
+        shutil.copyfile(source_path, target_path)
+    shutil.copystat(source_path, target_path)
+
+# Slotted dataclasses skip the per-instance __dict__ (dataclass slots need Python 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class BackupMetadata:
     """Metadata for backup operations"""
     backup_id: str
@@ -37,7 +113,7 @@ class BackupMetadata:
     error_message: Optional[str] = None
     duration_seconds: float = 0.0
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SyncTarget:
     """Configuration for backup target"""
     name: str
@@ -48,10 +124,37 @@ class SyncTarget:
     compression: bool = True
     encryption: bool = False
 
+_METADATA_FIELDS = frozenset(field.name for field in fields(BackupMetadata))
+
+def _metadata_from_dict(data: Dict[str, Any]) -> BackupMetadata:
+    """Rebuild BackupMetadata from its JSON form, ignoring unknown keys"""
+    values = {key: value for key, value in data.items() if key in _METADATA_FIELDS}
+    values['timestamp'] = datetime.fromisoformat(values['timestamp'])
+    return BackupMetadata(**values)
+
+@lru_cache(maxsize=8)
+def _metadata_as_dict(metadata: BackupMetadata) -> Dict[str, Any]:
+    """asdict() of a (frozen, hashable) BackupMetadata, computed once per instance; do not mutate"""
+    return asdict(metadata)
+
+def _sync_target_from_dict(data: Dict[str, Any]) -> SyncTarget:
+    """Rebuild a SyncTarget from its JSON form"""
+    return SyncTarget(
+        name=data['name'],
+        type=data['type'],
+        path=data['path'],
+        enabled=data.get('enabled', True),
+        last_sync=datetime.fromisoformat(data['last_sync']) if data.get('last_sync') else None,
+        compression=data.get('compression', True),
+        encryption=data.get('encryption', False)
+    )
+
 class DifferentialBackupManager:
     """Manages differential backups and syncing"""
     
-    def __init__(self, data_dir: str = "data", backup_dir: str = "backups"):
+    def __init__(self, data_dir: str = "data", backup_dir: str = "backups",
+                 compression_level: int = 1, compression_method: int = DEFAULT_COMPRESSION_METHOD,
+                 dedup_chunks: bool = False):
         self.data_dir = Path(data_dir)
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(exist_ok=True)
@@ -60,6 +163,7 @@ class DifferentialBackupManager:
         self.full_backups_dir = self.backup_dir / "full"
         self.differential_dir = self.backup_dir / "differential"
         self.metadata_dir = self.backup_dir / "metadata"
+        self.chunks_dir = self.backup_dir / "chunks"
         
         for dir_path in [self.full_backups_dir, self.differential_dir, self.metadata_dir]:
             dir_path.mkdir(exist_ok=True)
@@ -67,7 +171,17 @@ class DifferentialBackupManager:
         # Configuration
         self.max_differential_count = 10  # Create full backup after 10 differentials
         self.max_backup_age_days = 30    # Keep backups for 30 days
-        self.compression_level = 6       # ZIP compression level
+        self.compression_level = compression_level    # ZIP compression level (1 = fastest)
+        self.compression_method = compression_method  # zipfile.ZIP_ZSTANDARD, ZIP_DEFLATED or ZIP_STORED
+        self.dedup_chunks = dedup_chunks  # Full backups reference shared DB chunks instead of embedding the DB
+        self.max_concurrent_syncs = 8    # Sync targets copied in parallel
+        self.compression_workers = min(os.cpu_count() or 1, 8)  # Threads hashing/compressing DB chunks
+        
+        # Backup index, history and sync targets: each update is a single-row upsert
+        self._state_db = sqlite3.connect(self.metadata_dir / STATE_DB_NAME, check_same_thread=False)
+        self._state_db.execute('PRAGMA journal_mode=WAL')
+        self._state_db.execute('PRAGMA synchronous=NORMAL')
+        self._init_state_db()
         
         # Sync targets
         self.sync_targets: Dict[str, SyncTarget] = {}
@@ -76,30 +190,29 @@ class DifferentialBackupManager:
         # State tracking
         self.last_full_backup: Optional[BackupMetadata] = None
         self.last_differential_backup: Optional[BackupMetadata] = None
+        self._hash_cache: Optional[Tuple[int, int, str]] = None  # (mtime_ns, size, hash)
         self._load_backup_history()
         
     def _load_sync_targets(self):
         """Load sync target configurations"""
-        config_file = self.backup_dir / "sync_targets.json"
-        
-        if config_file.exists():
-            try:
+        try:
+            for (blob,) in self._state_db.execute('SELECT blob FROM sync_targets'):
+                target = _sync_target_from_dict(json.loads(blob))
+                self.sync_targets[target.name] = target
+            
+            # One-time import of the JSON config used before the state database
+            config_file = self.backup_dir / "sync_targets.json"
+            if not self.sync_targets and config_file.exists():
                 with open(config_file, 'r') as f:
                     targets_data = json.load(f)
-                    
-                for name, data in targets_data.items():
-                    self.sync_targets[name] = SyncTarget(
-                        name=data['name'],
-                        type=data['type'],
-                        path=data['path'],
-                        enabled=data.get('enabled', True),
-                        last_sync=datetime.fromisoformat(data['last_sync']) if data.get('last_sync') else None,
-                        compression=data.get('compression', True),
-                        encryption=data.get('encryption', False)
-                    )
-                    
-            except Exception as e:
-                logger.error(f"❌ Failed to load sync targets: {e}")
+                
+                for data in targets_data.values():
+                    target = _sync_target_from_dict(data)
+                    self.sync_targets[target.name] = target
+                self._save_sync_targets(self.sync_targets.values())
+                
+        except Exception as e:
+            logger.error(f"❌ Failed to load sync targets: {e}")
         
         # Add default local backup target if none exist
         if not self.sync_targets:
@@ -111,33 +224,22 @@ class DifferentialBackupManager:
                 compression=True
             ))
     
-    def _save_sync_targets(self):
+    def _save_sync_targets(self, targets: Iterable[SyncTarget]):
         """Save sync target configurations"""
-        config_file = self.backup_dir / "sync_targets.json"
-        
         try:
-            targets_data = {}
-            for name, target in self.sync_targets.items():
-                targets_data[name] = {
-                    'name': target.name,
-                    'type': target.type,
-                    'path': target.path,
-                    'enabled': target.enabled,
-                    'last_sync': target.last_sync.isoformat() if target.last_sync else None,
-                    'compression': target.compression,
-                    'encryption': target.encryption
-                }
-            
-            with open(config_file, 'w') as f:
-                json.dump(targets_data, f, indent=2)
-                
+            self._state_db.executemany(
+                'INSERT OR REPLACE INTO sync_targets VALUES (?, ?)',
+                [(target.name, _dump_json(target)) for target in targets]
+            )
+            self._state_db.commit()
+            
         except Exception as e:
             logger.error(f"❌ Failed to save sync targets: {e}")
     
     def add_sync_target(self, target: SyncTarget):
         """Add a new sync target"""
         self.sync_targets[target.name] = target
-        self._save_sync_targets()
+        self._save_sync_targets([target])
         
         # Create target directory if local
         if target.type == "local":
@@ -147,65 +249,80 @@ class DifferentialBackupManager:
     
     def _load_backup_history(self):
         """Load backup history metadata"""
-        history_file = self.metadata_dir / "backup_history.json"
-        
-        if history_file.exists():
-            try:
+        try:
+            history = {key: json.loads(value) for key, value in self._state_db.execute(
+                "SELECT key, value FROM kv WHERE key IN ('last_full_backup', 'last_differential_backup')"
+            )}
+            
+            # One-time import of the JSON history used before the state database
+            history_file = self.metadata_dir / "backup_history.json"
+            if not history and history_file.exists():
                 with open(history_file, 'r') as f:
                     history = json.load(f)
-                    
-                if 'last_full_backup' in history and history['last_full_backup']:
-                    data = history['last_full_backup']
-                    self.last_full_backup = BackupMetadata(
-                        backup_id=data['backup_id'],
-                        timestamp=datetime.fromisoformat(data['timestamp']),
-                        source_db_hash=data['source_db_hash'],
-                        changes_count=data['changes_count'],
-                        backup_size=data['backup_size'],
-                        backup_type=data['backup_type'],
-                        success=data['success'],
-                        error_message=data.get('error_message'),
-                        duration_seconds=data.get('duration_seconds', 0.0)
-                    )
+                for key, value in history.items():
+                    self._state_db.execute('INSERT OR REPLACE INTO kv VALUES (?, ?)', (key, _dump_json(value)))
+                self._state_db.commit()
                 
-                if 'last_differential_backup' in history and history['last_differential_backup']:
-                    data = history['last_differential_backup']
-                    self.last_differential_backup = BackupMetadata(
-                        backup_id=data['backup_id'],
-                        timestamp=datetime.fromisoformat(data['timestamp']),
-                        source_db_hash=data['source_db_hash'],
-                        changes_count=data['changes_count'],
-                        backup_size=data['backup_size'],
-                        backup_type=data['backup_type'],
-                        success=data['success'],
-                        error_message=data.get('error_message'),
-                        duration_seconds=data.get('duration_seconds', 0.0)
-                    )
-                    
-            except Exception as e:
-                logger.error(f"❌ Failed to load backup history: {e}")
+            if history.get('last_full_backup'):
+                self.last_full_backup = _metadata_from_dict(history['last_full_backup'])
+            
+            if history.get('last_differential_backup'):
+                self.last_differential_backup = _metadata_from_dict(history['last_differential_backup'])
+                
+        except Exception as e:
+            logger.error(f"❌ Failed to load backup history: {e}")
     
-    def _save_backup_history(self):
-        """Save backup history metadata"""
-        history_file = self.metadata_dir / "backup_history.json"
+    def _save_backup_history(self, metadata: BackupMetadata):
+        """Save the latest backup of metadata's type to the history"""
+        key = "last_full_backup" if metadata.backup_type == "full" else "last_differential_backup"
         
         try:
-            history = {}
+            self._state_db.execute('INSERT OR REPLACE INTO kv VALUES (?, ?)', (key, _dump_json(metadata)))
+            self._state_db.commit()
             
-            if self.last_full_backup:
-                history['last_full_backup'] = asdict(self.last_full_backup)
-                history['last_full_backup']['timestamp'] = self.last_full_backup.timestamp.isoformat()
-            
-            if self.last_differential_backup:
-                history['last_differential_backup'] = asdict(self.last_differential_backup)
-                history['last_differential_backup']['timestamp'] = self.last_differential_backup.timestamp.isoformat()
-            
-            with open(history_file, 'w') as f:
-                json.dump(history, f, indent=2, default=str)
-                
         except Exception as e:
             logger.error(f"❌ Failed to save backup history: {e}")
     
+    def _init_state_db(self):
+        """Create the state tables, seeding the backup index from the archives on disk the first time"""
+        self._state_db.execute('''
+            CREATE TABLE IF NOT EXISTS backups (
+                backup_id TEXT PRIMARY KEY,
+                ts INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                path TEXT NOT NULL
+            )
+        ''')
+        self._state_db.execute('CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL)')
+        self._state_db.execute('CREATE TABLE IF NOT EXISTS sync_targets (name TEXT PRIMARY KEY, blob BLOB NOT NULL)')
+        self._state_db.execute('CREATE INDEX IF NOT EXISTS idx_backups_type_ts ON backups(type, ts)')
+        
+        if self._state_db.execute('SELECT 1 FROM backups LIMIT 1').fetchone() is None:
+            rows = []
+            for backup_type, backup_dir in (("full", self.full_backups_dir), ("differential", self.differential_dir)):
+                for backup_file in backup_dir.glob("*.zip"):
+                    try:
+                        # backup_id is "<full|diff>_%Y%m%d_%H%M%S"
+                        backup_time = datetime.strptime(backup_file.stem.split("_", 1)[1], "%Y%m%d_%H%M%S")
+                    except (IndexError, ValueError):
+                        logger.warning(f"⚠️ Skipping unrecognized backup file: {backup_file}")
+                        continue
+                    rows.append((backup_file.stem, int(backup_time.timestamp()), backup_type,
+                                 backup_file.stat().st_size, str(backup_file)))
+            self._state_db.executemany('INSERT OR REPLACE INTO backups VALUES (?, ?, ?, ?, ?)', rows)
+        
+        self._state_db.commit()
+    
+    def _index_backup(self, metadata: BackupMetadata, backup_path: Path):
+        """Record a newly written backup archive in the index"""
+        self._state_db.execute(
+            'INSERT OR REPLACE INTO backups VALUES (?, ?, ?, ?, ?)',
+            (metadata.backup_id, int(metadata.timestamp.timestamp()), metadata.backup_type,
+             metadata.backup_size, str(backup_path))
+        )
+        self._state_db.commit()
+    
     def _calculate_db_hash(self) -> str:
         """Calculate hash of the current database state"""
         try:
@@ -213,17 +330,44 @@ class DifferentialBackupManager:
             if not db_path.exists():
                 return "empty"
             
-            hash_md5 = hashlib.md5()
+            # An unchanged mtime and size means an unchanged file - skip the full read
+            st = db_path.stat()
+            if self._hash_cache and self._hash_cache[:2] == (st.st_mtime_ns, st.st_size):
+                return self._hash_cache[2]
+            
+            file_hash = xxhash.xxh3_64() if XXHASH_AVAILABLE else hashlib.md5()
             with open(db_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    file_hash.update(chunk)
             
-            return hash_md5.hexdigest()
+            digest = file_hash.hexdigest()
+            self._hash_cache = (st.st_mtime_ns, st.st_size, digest)
+            return digest
             
         except Exception as e:
             logger.error(f"❌ Failed to calculate DB hash: {e}")
             return "error"
     
+    def _sample_entropy(self, path: Path) -> float:
+        """Shannon entropy (bits per byte) of the first ENTROPY_SAMPLE_SIZE bytes of a file"""
+        with open(path, "rb") as f:
+            sample = f.read(ENTROPY_SAMPLE_SIZE)
+        if not sample:
+            return 0.0
+        
+        counts = [sample.count(bytes([value])) for value in range(256)]
+        return -sum(count / len(sample) * math.log2(count / len(sample)) for count in counts if count)
+    
+    def _compress_type_for(self, path: Path) -> int:
+        """Store files that are already compressed or encrypted; deflating them only burns CPU"""
+        if self.compression_method == zipfile.ZIP_STORED:
+            return zipfile.ZIP_STORED
+        if self._sample_entropy(path) > STORE_ENTROPY_THRESHOLD:
+            return zipfile.ZIP_STORED
+        return self.compression_method
+    
     async def needs_backup(self) -> Tuple[bool, str]:
         """Check if backup is needed and what type"""
         current_hash = self._calculate_db_hash()
@@ -257,18 +401,10 @@ class DifferentialBackupManager:
         if not self.last_full_backup:
             return 0
         
-        count = 0
-        for backup_file in self.differential_dir.glob("*.zip"):
-            # Extract timestamp from filename
-            try:
-                timestamp_str = backup_file.stem.split("_")[-1]
-                backup_time = datetime.fromisoformat(timestamp_str.replace("-", ":"))
-                if backup_time > self.last_full_backup.timestamp:
-                    count += 1
-            except Exception:
-                continue
-        
-        return count
+        return self._state_db.execute(
+            "SELECT COUNT(*) FROM backups WHERE type = 'differential' AND ts > ?",
+            (int(self.last_full_backup.timestamp.timestamp()),)
+        ).fetchone()[0]
     
     async def create_backup(self, force_full: bool = False) -> Optional[BackupMetadata]:
         """Create a backup (full or differential)"""
@@ -300,7 +436,9 @@ class DifferentialBackupManager:
                 else:
                     self.last_differential_backup = metadata
                 
-                self._save_backup_history()
+                self._save_backup_history(metadata)
+                if metadata.backup_size:  # Differentials without changes write no file
+                    self._index_backup(metadata, self._backup_path(metadata))
                 
                 # Sync to targets
                 await self._sync_to_targets(metadata)
@@ -333,39 +471,16 @@ class DifferentialBackupManager:
         
         try:
             # Calculate current DB hash
-            db_hash = self._calculate_db_hash()
+            db_hash = await asyncio.to_thread(self._calculate_db_hash)
             
             # Create backup filename
             backup_filename = f"{backup_id}.zip"
             backup_path = self.full_backups_dir / backup_filename
             
-            # Create ZIP archive
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=self.compression_level) as zipf:
-                # Add main database
-                db_path = self.data_dir / "telegram_manager.db"
-                if db_path.exists():
-                    zipf.write(db_path, "telegram_manager.db")
-                
-                # Add changes tracking database
-                changes_db_path = self.data_dir / "changes_tracking.db"
-                if changes_db_path.exists():
-                    zipf.write(changes_db_path, "changes_tracking.db")
-                
-                # Add any other data files
-                for data_file in self.data_dir.glob("*.json"):
-                    zipf.write(data_file, data_file.name)
-                
-                # Add metadata
-                metadata = {
-                    'backup_id': backup_id,
-                    'timestamp': start_time.isoformat(),
-                    'backup_type': 'full',
-                    'db_hash': db_hash
-                }
-                zipf.writestr("backup_metadata.json", json.dumps(metadata, indent=2))
-            
-            # Calculate backup size
-            backup_size = backup_path.stat().st_size
+            # Build the archive off the event loop
+            backup_size = await asyncio.to_thread(
+                self._build_full_zip, backup_path, backup_id, db_hash, start_time
+            )
             duration = (datetime.now() - start_time).total_seconds()
             
             return BackupMetadata(
@@ -383,6 +498,79 @@ class DifferentialBackupManager:
             logger.error(f"❌ Full backup failed: {e}")
             raise
     
+    def _build_full_zip(self, backup_path: Path, backup_id: str, db_hash: str,
+                        start_time: datetime) -> int:
+        """Write the full backup archive and return its size (blocking)"""
+        with zipfile.ZipFile(backup_path, 'w', self.compression_method, compresslevel=self.compression_level) as zipf:
+            # Add main database
+            db_path = self.data_dir / "telegram_manager.db"
+            if db_path.exists() and self.dedup_chunks:
+                zipf.writestr(DB_RECIPE_NAME, json.dumps(self._store_db_chunks(db_path)))
+            elif db_path.exists():
+                zipf.write(db_path, "telegram_manager.db", compress_type=self._compress_type_for(db_path))
+                
+            # Add changes tracking database
+            changes_db_path = self.data_dir / "changes_tracking.db"
+            if changes_db_path.exists():
+                zipf.write(changes_db_path, "changes_tracking.db",
+                           compress_type=self._compress_type_for(changes_db_path))
+                
+            # Add any other data files
+            json_compress_type = (zipfile.ZIP_STORED if self.compression_method == zipfile.ZIP_STORED
+                                  else zipfile.ZIP_DEFLATED)
+            for data_file in self.data_dir.glob("*.json"):
+                zipf.write(data_file, data_file.name, compress_type=json_compress_type,
+                           compresslevel=JSON_COMPRESSION_LEVEL)
+                
+            # Add metadata
+            metadata = {
+                'backup_id': backup_id,
+                'timestamp': start_time.isoformat(),
+                'backup_type': 'full',
+                'db_hash': db_hash
+            }
+            zipf.writestr("backup_metadata.json", json.dumps(metadata, indent=2))
+        
+        return backup_path.stat().st_size
+    
+    def _chunk_path(self, chunks_dir: Path, digest: str) -> Path:
+        """Location of a chunk in a chunk store"""
+        return chunks_dir / digest[:2] / digest
+    
+    def _store_chunk(self, chunk: bytes) -> str:
+        """Write one chunk to the chunk store if it is new; returns its digest"""
+        digest = hashlib.blake2b(chunk, digest_size=20).hexdigest()
+        chunk_path = self._chunk_path(self.chunks_dir, digest)
+        if not chunk_path.exists():
+            chunk_path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-thread temp name: identical chunks may be stored by two workers at once
+            tmp_path = chunk_path.parent / f"{digest}.{threading.get_ident()}.tmp"
+            tmp_path.write_bytes(zlib.compress(chunk, max(self.compression_level, 1)))
+            os.replace(tmp_path, chunk_path)
+        return digest
+    
+    def _store_db_chunks(self, db_path: Path) -> Dict[str, Any]:
+        """Write the database's new chunks to the chunk store; returns the recipe to rebuild it"""
+        # hashlib and zlib release the GIL, so chunks are hashed and compressed on several cores
+        digests = []
+        pending = deque()
+        with open(db_path, "rb") as f, ThreadPoolExecutor(max_workers=self.compression_workers) as pool:
+            for chunk in iter(lambda: f.read(DEDUP_CHUNK_SIZE), b""):
+                pending.append(pool.submit(self._store_chunk, chunk))
+                # Bound the read-ahead so only a few chunks per worker are held in memory
+                if len(pending) >= 2 * self.compression_workers:
+                    digests.append(pending.popleft().result())
+            digests.extend(future.result() for future in pending)
+        
+        return {"chunk_size": DEDUP_CHUNK_SIZE, "chunks": digests}
+    
+    def _read_recipe(self, backup_path: Path) -> Optional[Dict[str, Any]]:
+        """Chunk recipe of a deduplicated full backup, or None for a self-contained archive"""
+        with zipfile.ZipFile(backup_path, 'r') as zipf:
+            if DB_RECIPE_NAME not in zipf.namelist():
+                return None
+            return json.loads(zipf.read(DB_RECIPE_NAME))
+    
     async def _create_differential_backup(self) -> BackupMetadata:
         """Create a differential backup with only changes"""
         start_time = datetime.now()
@@ -393,6 +581,10 @@ class DifferentialBackupManager:
             from .async_data_manager import get_async_data_manager
             data_manager = await get_async_data_manager()
             
+            # Hash once, before reading changes: anything written after this point
+            # changes the file hash and is picked up by the next backup
+            db_hash = await asyncio.to_thread(self._calculate_db_hash)
+            
             # Get unsynced changes
             changes = await data_manager.get_unsynced_changes(limit=10000)
             
@@ -401,7 +593,7 @@ class DifferentialBackupManager:
                 return BackupMetadata(
                     backup_id=backup_id,
                     timestamp=start_time,
-                    source_db_hash=self._calculate_db_hash(),
+                    source_db_hash=db_hash,
                     changes_count=0,
                     backup_size=0,
                     backup_type="differential",
@@ -413,46 +605,19 @@ class DifferentialBackupManager:
             backup_filename = f"{backup_id}.zip"
             backup_path = self.differential_dir / backup_filename
             
-            # Create ZIP archive with changes
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=self.compression_level) as zipf:
-                # Add changes data
-                changes_data = []
-                for change in changes:
-                    changes_data.append({
-                        'id': change.id,
-                        'entity_type': change.entity_type,
-                        'entity_id': change.entity_id,
-                        'operation': change.operation,
-                        'content_hash': change.content_hash,
-                        'change_data': change.change_data,
-                        'timestamp': change.timestamp.isoformat()
-                    })
-                
-                zipf.writestr("changes.json", json.dumps(changes_data, indent=2))
-                
-                # Add metadata
-                metadata = {
-                    'backup_id': backup_id,
-                    'timestamp': start_time.isoformat(),
-                    'backup_type': 'differential',
-                    'changes_count': len(changes),
-                    'base_backup': self.last_full_backup.backup_id if self.last_full_backup else None,
-                    'db_hash': self._calculate_db_hash()
-                }
-                zipf.writestr("backup_metadata.json", json.dumps(metadata, indent=2))
-            
-            # Calculate backup size
-            backup_size = backup_path.stat().st_size
+            # Build the archive off the event loop
+            backup_size, change_ids = await asyncio.to_thread(
+                self._build_differential_zip, backup_path, backup_id, changes, db_hash, start_time
+            )
             duration = (datetime.now() - start_time).total_seconds()
             
             # Mark changes as synced
-            change_ids = [change.id for change in changes]
             await data_manager.mark_changes_synced(change_ids)
             
             return BackupMetadata(
                 backup_id=backup_id,
                 timestamp=start_time,
-                source_db_hash=self._calculate_db_hash(),
+                source_db_hash=db_hash,
                 changes_count=len(changes),
                 backup_size=backup_size,
                 backup_type="differential",
@@ -464,48 +629,100 @@ class DifferentialBackupManager:
             logger.error(f"❌ Differential backup failed: {e}")
             raise
     
+    def _build_differential_zip(self, backup_path: Path, backup_id: str, changes: List[Any],
+                                db_hash: str, start_time: datetime) -> Tuple[int, List[str]]:
+        """Write the differential archive; return its size and the archived change ids (blocking)"""
+        with zipfile.ZipFile(backup_path, 'w', self.compression_method, compresslevel=self.compression_level) as zipf:
+            # Stream changes into the archive entry one record at a time,
+            # collecting their ids in the same pass
+            change_ids = []
+            with zipf.open("changes.json", "w") as out:
+                for i, change in enumerate(changes):
+                    change_ids.append(change.id)
+                    out.write(b',' if i else b'[')
+                    out.write(_dump_json({
+                        'id': change.id,
+                        'entity_type': change.entity_type,
+                        'entity_id': change.entity_id,
+                        'operation': change.operation,
+                        'content_hash': change.content_hash,
+                        'change_data': change.change_data,
+                        'timestamp': change.timestamp  # encoded as ISO 8601 by _dump_json
+                    }))
+                out.write(b']')
+                
+            # Add metadata
+            metadata = {
+                'backup_id': backup_id,
+                'timestamp': start_time.isoformat(),
+                'backup_type': 'differential',
+                'changes_count': len(changes),
+                'base_backup': self.last_full_backup.backup_id if self.last_full_backup else None,
+                'db_hash': db_hash
+            }
+            zipf.writestr("backup_metadata.json", json.dumps(metadata, indent=2))
+        
+        return backup_path.stat().st_size, change_ids
+    
+    def _backup_path(self, metadata: BackupMetadata) -> Path:
+        """Archive location for a backup"""
+        backup_dir = self.full_backups_dir if metadata.backup_type == "full" else self.differential_dir
+        return backup_dir / f"{metadata.backup_id}.zip"
+    
     async def _sync_to_targets(self, metadata: BackupMetadata):
         """Sync backup to configured targets"""
-        backup_filename = f"{metadata.backup_id}.zip"
-        
-        if metadata.backup_type == "full":
-            source_path = self.full_backups_dir / backup_filename
-        else:
-            source_path = self.differential_dir / backup_filename
+        source_path = self._backup_path(metadata)
         
         if not source_path.exists():
             logger.error(f"❌ Backup file not found: {source_path}")
             return
         
-        for target in self.sync_targets.values():
-            if not target.enabled:
-                continue
-            
-            try:
-                if target.type == "local":
-                    await self._sync_to_local_target(source_path, target, metadata)
-                elif target.type == "cloud":
-                    await self._sync_to_cloud_target(source_path, target, metadata)
-                # Add more target types as needed
-                
-                target.last_sync = datetime.now()
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to sync to target {target.name}: {e}")
+        # Targets are independent destinations, so sync them concurrently
+        semaphore = asyncio.Semaphore(self.max_concurrent_syncs)
+        
+        async def sync_target(target: SyncTarget):
+            async with semaphore:
+                try:
+                    if target.type == "local":
+                        await self._sync_to_local_target(source_path, target, metadata)
+                    elif target.type == "cloud":
+                        await self._sync_to_cloud_target(source_path, target, metadata)
+                    # Add more target types as needed
+                    
+                    target.last_sync = datetime.now()
+                    
+                except Exception as e:
+                    logger.error(f"❌ Failed to sync to target {target.name}: {e}")
+        
+        enabled_targets = [target for target in self.sync_targets.values() if target.enabled]
+        await asyncio.gather(*(sync_target(target) for target in enabled_targets))
         
-        self._save_sync_targets()
+        self._save_sync_targets(enabled_targets)
     
     async def _sync_to_local_target(self, source_path: Path, target: SyncTarget, metadata: BackupMetadata):
         """Sync backup to local target"""
-        target_dir = Path(target.path)
+        # File copies block, so keep them off the event loop
+        await asyncio.to_thread(self._copy_to_local_target, source_path, Path(target.path), metadata.backup_type)
+        
+        logger.info(f"📁 Synced to local target: {target.name}")
+    
+    def _copy_to_local_target(self, source_path: Path, target_dir: Path, backup_type: str):
+        """Copy a backup archive (and any chunks it references) into a local target directory"""
         target_dir.mkdir(parents=True, exist_ok=True)
         
         target_path = target_dir / source_path.name
         
-        # Copy file
-        shutil.copy2(source_path, target_path)
+        # Deduplicated backups need their chunks at the target too; copy only the missing ones
+        if backup_type == "full":
+            recipe = self._read_recipe(source_path)
+            for digest in (recipe or {}).get("chunks", []):
+                chunk_target = self._chunk_path(target_dir / "chunks", digest)
+                if not chunk_target.exists():
+                    chunk_target.parent.mkdir(parents=True, exist_ok=True)
+                    _fast_copy(self._chunk_path(self.chunks_dir, digest), chunk_target)
         
-        logger.info(f"📁 Synced to local target: {target.name}")
+        # Copy file
+        _fast_copy(source_path, target_path)
     
     async def _sync_to_cloud_target(self, source_path: Path, target: SyncTarget, metadata: BackupMetadata):
         """Sync backup to cloud target (placeholder for cloud implementation)"""
@@ -516,32 +733,42 @@ class DifferentialBackupManager:
         """Clean up old backup files"""
         cutoff_date = datetime.now() - timedelta(days=self.max_backup_age_days)
         
-        # Clean up full backups
-        for backup_file in self.full_backups_dir.glob("*.zip"):
+        expired = self._state_db.execute(
+            'SELECT backup_id, type, path FROM backups WHERE ts < ?', (int(cutoff_date.timestamp()),)
+        ).fetchall()
+        
+        removed = []
+        for backup_id, backup_type, path in expired:
             try:
-                # Extract timestamp from filename
-                timestamp_str = backup_file.stem.split("_")[1]
-                backup_time = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
+                Path(path).unlink(missing_ok=True)
+                removed.append((backup_id,))
+                logger.info(f"🗑️ Removed old {backup_type} backup: {backup_id}.zip")
                 
-                if backup_time < cutoff_date:
-                    backup_file.unlink()
-                    logger.info(f"🗑️ Removed old full backup: {backup_file.name}")
-
             except Exception as e:
-                logger.error(f"❌ Failed to process backup file {backup_file}: {e}")
+                logger.error(f"❌ Failed to process backup file {path}: {e}")
+        
+        self._state_db.executemany('DELETE FROM backups WHERE backup_id = ?', removed)
+        self._state_db.commit()
+        
+        self._remove_unreferenced_chunks()
+    
+    def _remove_unreferenced_chunks(self):
+        """Delete chunks no remaining full backup refers to"""
+        if not self.chunks_dir.exists():
+            return
         
-        # Clean up differential backups
-        for backup_file in self.differential_dir.glob("*.zip"):
+        referenced = set()
+        for backup_file in self.full_backups_dir.glob("*.zip"):
             try:
-                timestamp_str = backup_file.stem.split("_")[1]
-                backup_time = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                
-                if backup_time < cutoff_date:
-                    backup_file.unlink()
-                    logger.info(f"🗑️ Removed old differential backup: {backup_file.name}")
-                    
+                referenced.update((self._read_recipe(backup_file) or {}).get("chunks", []))
             except Exception as e:
-                logger.error(f"❌ Failed to process backup file {backup_file}: {e}")
+                # An unreadable archive might still need its chunks - keep everything
+                logger.error(f"❌ Failed to read chunk recipe from {backup_file}: {e}")
+                return
+        
+        for chunk_path in self.chunks_dir.glob("*/*"):
+            if chunk_path.name not in referenced:
+                chunk_path.unlink()
     
     async def restore_from_backup(self, backup_id: str) -> bool:
         """Restore database from backup"""
@@ -590,7 +817,17 @@ class DifferentialBackupManager:
             
             # Extract backup
             with zipfile.ZipFile(backup_file, 'r') as zipf:
-                zipf.extractall(self.data_dir)
+                members = [name for name in zipf.namelist() if name != DB_RECIPE_NAME]
+                zipf.extractall(self.data_dir, members)
+            
+            # Rebuild a deduplicated database from its chunks
+            recipe = self._read_recipe(backup_file)
+            if recipe:
+                tmp_path = db_path.with_suffix(".restore")
+                with open(tmp_path, "wb") as out:
+                    for digest in recipe["chunks"]:
+                        out.write(zlib.decompress(self._chunk_path(self.chunks_dir, digest).read_bytes()))
+                os.replace(tmp_path, db_path)
             
             logger.info(f"✅ Full backup restored successfully")
             return True
@@ -608,16 +845,22 @@ class DifferentialBackupManager:
     
     async def get_backup_status(self) -> Dict[str, Any]:
         """Get current backup status and statistics"""
-        full_backups = list(self.full_backups_dir.glob("*.zip"))
-        diff_backups = list(self.differential_dir.glob("*.zip"))
+        totals = {
+            backup_type: (count, size)
+            for backup_type, count, size in self._state_db.execute(
+                'SELECT type, COUNT(*), SUM(size) FROM backups GROUP BY type'
+            )
+        }
+        full_count, full_size = totals.get("full", (0, 0))
+        diff_count, diff_size = totals.get("differential", (0, 0))
         
-        total_backup_size = sum(f.stat().st_size for f in full_backups + diff_backups)
+        total_backup_size = full_size + diff_size
 
         return {
-            "last_full_backup": asdict(self.last_full_backup) if self.last_full_backup else None,
-            "last_differential_backup": asdict(self.last_differential_backup) if self.last_differential_backup else None,
-            "full_backups_count": len(full_backups),
-            "differential_backups_count": len(diff_backups),
+            "last_full_backup": dict(_metadata_as_dict(self.last_full_backup)) if self.last_full_backup else None,
+            "last_differential_backup": dict(_metadata_as_dict(self.last_differential_backup)) if self.last_differential_backup else None,
+            "full_backups_count": full_count,
+            "differential_backups_count": diff_count,
             "total_backup_size_mb": total_backup_size / (1024 * 1024),
             "sync_targets": {name: asdict(target) for name, target in self.sync_targets.items()},
             "needs_backup": await self.needs_backup(),
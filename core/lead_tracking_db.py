@@ -7,18 +7,471 @@ group chats, and tracking leads with Google Sheets integration.
 """
 
 import sqlite3
+import csv
 import logging
 import json
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any, Union
-from dataclasses import dataclass, asdict
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Any, Union
+from dataclasses import dataclass, asdict, fields
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 import pandas as pd
 from enum import Enum
 
+try:
+    import aiosqlite
+    AIOSQLITE_AVAILABLE = True
+except ImportError:
+    AIOSQLITE_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# SQLite's default limit on bound parameters per statement (SQLITE_MAX_VARIABLE_NUMBER before 3.32)
+SQLITE_MAX_VARIABLES = 999
+
+# Current local time in datetime.isoformat() layout (millisecond precision), computed by SQLite
+SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+# UPSERT ... RETURNING needs SQLite 3.35+
+SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Contact row created for a message's sender the first time they are seen
+MESSAGE_CONTACT_INSERT_SQL = """
+    INSERT INTO contacts (
+        user_id, first_name, last_name, username, phone_number, bio,
+        contact_type, lead_status, lead_score, estimated_value, probability,
+        tags, notes, last_interaction, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, '', '', ?, ?, 0, 0.0, 0, '', '', ?, ?, ?)
+"""
+
+# ...or, for a sender already known, just their last_interaction touched - in one statement
+MESSAGE_CONTACT_UPSERT_SQL = MESSAGE_CONTACT_INSERT_SQL + """
+    ON CONFLICT(user_id) DO UPDATE SET
+        last_interaction = excluded.last_interaction,
+        updated_at = excluded.updated_at
+    RETURNING contact_id
+"""
+
+# Statements shared by the single-row and bulk writers. Each is one fixed string, so the
+# connection's statement cache keeps a single prepared copy per statement; bulk writers
+# append their multi-row VALUES lists (see LeadTrackingDB._insert_rows) to the *_INSERT_HEAD forms
+ORGANIZATION_INSERT_HEAD = """
+    INSERT INTO organizations (
+        name, industry, size, location, website, description,
+        organization_type, funding_stage, market_cap, employee_count,
+        tags, created_at, updated_at
+    ) VALUES
+"""
+ORGANIZATION_ROW_PLACEHOLDERS = f"(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {SQL_NOW}, {SQL_NOW})"
+ORGANIZATION_INSERT_SQL = ORGANIZATION_INSERT_HEAD + ORGANIZATION_ROW_PLACEHOLDERS
+
+CONTACT_INSERT_SQL = f"""
+    INSERT INTO contacts (
+        user_id, first_name, last_name, username, phone_number, bio,
+        organization_id, contact_type, lead_status, lead_score,
+        estimated_value, probability, tags, notes, last_interaction,
+        next_follow_up, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {SQL_NOW}, {SQL_NOW})
+"""
+
+# Upserts update the existing row in place: INSERT OR REPLACE deletes and re-inserts it,
+# rewriting every index entry and resetting created_at
+GROUP_CHAT_INSERT_HEAD = """
+    INSERT INTO group_chats (
+        chat_id, title, chat_type, member_count, description,
+        organization_id, is_active, tags, created_at, updated_at
+    ) VALUES
+"""
+GROUP_CHAT_ROW_PLACEHOLDERS = f"(?, ?, ?, ?, ?, ?, ?, ?, {SQL_NOW}, {SQL_NOW})"
+GROUP_CHAT_UPSERT_CLAUSE = """
+    ON CONFLICT(chat_id) DO UPDATE SET
+        title = excluded.title,
+        chat_type = excluded.chat_type,
+        member_count = excluded.member_count,
+        description = excluded.description,
+        organization_id = excluded.organization_id,
+        is_active = excluded.is_active,
+        tags = excluded.tags,
+        updated_at = excluded.updated_at
+"""
+GROUP_CHAT_UPSERT_SQL = GROUP_CHAT_INSERT_HEAD + GROUP_CHAT_ROW_PLACEHOLDERS + GROUP_CHAT_UPSERT_CLAUSE
+
+# A message only tells us the chat's title and type; its other details are left as they are.
+# store_messages_bulk stamps every row of a batch with the same Python-side time
+MESSAGE_GROUP_CHAT_UPSERT_SQL = GROUP_CHAT_INSERT_HEAD + """(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(chat_id) DO UPDATE SET
+        title = excluded.title,
+        chat_type = excluded.chat_type,
+        updated_at = excluded.updated_at
+"""
+
+MESSAGE_CONTACT_TOUCH_SQL = "UPDATE contacts SET last_interaction = ?, updated_at = ? WHERE contact_id = ?"
+
+# A message is identified by its Telegram ID within its chat (idx_messages_chat_message);
+# storing it again (e.g. an edit) updates the text in place
+MESSAGE_INSERT_HEAD = """
+    INSERT INTO messages (
+        telegram_message_id, chat_id, contact_id, message_text,
+        message_type, timestamp, is_outbound, created_at
+    )
+"""
+MESSAGE_UPSERT_CLAUSE = """
+    ON CONFLICT(chat_id, telegram_message_id) DO UPDATE SET
+        contact_id = excluded.contact_id,
+        message_text = excluded.message_text,
+        message_type = excluded.message_type,
+        timestamp = excluded.timestamp,
+        is_outbound = excluded.is_outbound
+"""
+MESSAGE_UPSERT_SQL = MESSAGE_INSERT_HEAD + "VALUES (?, ?, ?, ?, ?, ?, ?, ?)" + MESSAGE_UPSERT_CLAUSE
+
+def _message_timestamp(value: Any) -> Any:
+    """A message timestamp (datetime or ISO string) as a UTC isoformat() string, the layout Telegram
+    dates are stored in; naive values are taken as local time, unparseable ones are kept as given"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat()
+    return value
+
+# Migration inserts each new sender once and only moves an existing contact's last_interaction
+# forward. Contacts are never upserted: a conflicting INSERT still consumes an AUTOINCREMENT id
+MIGRATION_CONTACT_TOUCH_SQL = """
+    UPDATE contacts SET last_interaction = ?, updated_at = ?
+    WHERE contact_id = ? AND ? > COALESCE(last_interaction, '')
+"""
+
+MIGRATION_GROUP_CHAT_INSERT_SQL = GROUP_CHAT_INSERT_HEAD.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1) + \
+    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# The sender's contact_id is looked up in SQLite rather than mapped in Python
+# (an upsert after INSERT ... SELECT needs the WHERE to parse unambiguously)
+MIGRATION_MESSAGE_UPSERT_SQL = MESSAGE_INSERT_HEAD + """
+    SELECT ?, ?, (SELECT contact_id FROM contacts WHERE user_id = ?), ?, ?, ?, ?, ?
+    WHERE true
+""" + MESSAGE_UPSERT_CLAUSE
+
+# Rows per batch when migrating an old database
+MIGRATION_BATCH_SIZE = 10_000
+
+INTERACTION_INSERT_SQL = f"""
+    INSERT INTO interactions (
+        contact_id, chat_id, interaction_type, interaction_date,
+        subject, notes, outcome, next_action, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, {SQL_NOW})
+"""
+
+LEAD_INSERT_SQL = f"""
+    INSERT INTO leads (
+        contact_id, opportunity_type, estimated_value, probability,
+        stage, source, assigned_to, last_activity, next_follow_up,
+        deal_size, timeline, decision_makers, pain_points,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {SQL_NOW}, {SQL_NOW})
+"""
+
+# Trigram full-text index over organizations: substring search like LIKE '%q%', but indexed
+ORGANIZATIONS_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE organizations_fts USING fts5(
+        name, industry, description,
+        content='organizations', content_rowid='organization_id', tokenize='trigram'
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS organizations_fts_ai AFTER INSERT ON organizations BEGIN
+        INSERT INTO organizations_fts(rowid, name, industry, description)
+        VALUES (new.organization_id, new.name, new.industry, new.description);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS organizations_fts_ad AFTER DELETE ON organizations BEGIN
+        INSERT INTO organizations_fts(organizations_fts, rowid, name, industry, description)
+        VALUES ('delete', old.organization_id, old.name, old.industry, old.description);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS organizations_fts_au AFTER UPDATE ON organizations BEGIN
+        INSERT INTO organizations_fts(organizations_fts, rowid, name, industry, description)
+        VALUES ('delete', old.organization_id, old.name, old.industry, old.description);
+        INSERT INTO organizations_fts(rowid, name, industry, description)
+        VALUES (new.organization_id, new.name, new.industry, new.description);
+    END;
+    
+    INSERT INTO organizations_fts(organizations_fts) VALUES ('rebuild');
+"""
+
+# Shadow table of contact tags (contacts.tags holds a JSON array), kept in sync by triggers
+# so tag lookups use an index instead of parsing every row's JSON
+_CONTACT_TAGS_FROM_NEW = """
+    SELECT NEW.contact_id, value
+    FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END)
+    WHERE type = 'text'
+"""
+
+CONTACT_TAGS_SCHEMA = f"""
+    CREATE TABLE contact_tags (
+        contact_id INTEGER NOT NULL,
+        tag TEXT NOT NULL COLLATE NOCASE,
+        PRIMARY KEY (contact_id, tag)
+    );
+    CREATE INDEX IF NOT EXISTS idx_contact_tags_tag ON contact_tags(tag);
+    
+    CREATE TRIGGER IF NOT EXISTS contact_tags_ai AFTER INSERT ON contacts BEGIN
+        INSERT OR IGNORE INTO contact_tags (contact_id, tag) {_CONTACT_TAGS_FROM_NEW};
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS contact_tags_au AFTER UPDATE OF tags ON contacts BEGIN
+        DELETE FROM contact_tags WHERE contact_id = OLD.contact_id;
+        INSERT OR IGNORE INTO contact_tags (contact_id, tag) {_CONTACT_TAGS_FROM_NEW};
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS contact_tags_ad AFTER DELETE ON contacts BEGIN
+        DELETE FROM contact_tags WHERE contact_id = OLD.contact_id;
+    END;
+    
+    INSERT OR IGNORE INTO contact_tags (contact_id, tag)
+    SELECT c.contact_id, j.value
+    FROM contacts c, json_each(CASE WHEN json_valid(c.tags) THEN c.tags ELSE '[]' END) j
+    WHERE j.type = 'text';
+"""
+
+# Seconds a connection waits on another process's lock before raising "database is locked"
+# (sqlite3.connect's timeout, i.e. PRAGMA busy_timeout; the default is 5)
+BUSY_TIMEOUT = 30.0
+
+# Read-only connections serving the read methods alongside the writer connection (WAL lets them run concurrently)
+READ_POOL_SIZE = 4
+
+# Rows ANALYZE samples per index (PRAGMA analysis_limit)
+ANALYSIS_ROW_LIMIT = 1000
+
+# Trigram tokens are 3 characters, so shorter search terms cannot use the index
+FTS_MIN_QUERY_LENGTH = 3
+
+# Read queries shared by the sync methods and their *_async counterparts
+HOT_LEADS_SQL = """
+    SELECT 
+        c.contact_id,
+        c.first_name,
+        c.last_name,
+        c.username,
+        c.lead_status,
+        c.lead_score,
+        c.estimated_value,
+        c.probability,
+        c.last_interaction,
+        c.next_follow_up,
+        o.name as organization_name,
+        o.organization_type
+    FROM contacts c
+    LEFT JOIN organizations o ON c.organization_id = o.organization_id
+    WHERE c.lead_status IN ('hot', 'qualified', 'proposal', 'negotiation')
+       OR c.lead_score >= 70
+    ORDER BY c.lead_score DESC, c.estimated_value DESC
+    LIMIT ?
+"""
+
+# Only the columns the follow-up views show. Oldest last_interaction first is the same order as
+# days_since_contact DESC, but walks idx_contacts_followup instead of sorting computed values
+FOLLOW_UP_NEEDED_SQL = """
+    SELECT 
+        c.contact_id,
+        c.first_name,
+        c.last_name,
+        c.username,
+        c.lead_status,
+        c.lead_score,
+        c.estimated_value,
+        c.last_interaction,
+        o.name as organization_name,
+        julianday('now') - julianday(c.last_interaction) as days_since_contact
+    FROM contacts c
+    LEFT JOIN organizations o ON c.organization_id = o.organization_id
+    WHERE c.last_interaction < ?
+       AND c.lead_status NOT IN ('closed_won', 'closed_lost')
+       AND c.contact_type IN ('lead', 'customer', 'investor', 'partner')
+    ORDER BY c.last_interaction, c.lead_score DESC
+"""
+
+# Every dashboard metric in one statement, as (metric, key, value) rows; key is NULL for totals.
+# The cutoffs are bound from Python in the layout each column is stored in (UTC for message
+# timestamps, local time for interaction dates), so the activity counts are index range scans
+# against a constant
+DASHBOARD_STATS_SQL = """
+    -- Contact stats
+    SELECT 'total_contacts' AS metric, NULL AS key, COUNT(*) AS value FROM contacts
+    UNION ALL SELECT 'contacts_by_status', lead_status, COUNT(*) FROM contacts GROUP BY lead_status
+    UNION ALL SELECT 'contacts_by_type', contact_type, COUNT(*) FROM contacts GROUP BY contact_type
+    -- Organization stats
+    UNION ALL SELECT 'total_organizations', NULL, COUNT(*) FROM organizations
+    UNION ALL SELECT 'organizations_by_type', organization_type, COUNT(*) FROM organizations GROUP BY organization_type
+    -- Lead stats
+    UNION ALL SELECT 'total_leads', NULL, COUNT(*) FROM leads
+    UNION ALL SELECT 'pipeline_value', NULL, COALESCE(SUM(estimated_value), 0) FROM leads WHERE stage NOT IN ('closed_lost')
+    UNION ALL SELECT 'leads_by_stage', stage, COUNT(*) FROM leads GROUP BY stage
+    -- Activity stats
+    UNION ALL SELECT 'messages_last_7_days', NULL, COUNT(*) FROM messages WHERE timestamp > :messages_since
+    UNION ALL SELECT 'interactions_last_7_days', NULL, COUNT(*) FROM interactions WHERE interaction_date > :interactions_since
+"""
+
+DASHBOARD_GROUPED_METRICS = ('contacts_by_status', 'contacts_by_type', 'organizations_by_type', 'leads_by_stage')
+
+def _copy_dashboard_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a stats dict (and its nested metric dicts) that callers may modify"""
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in stats.items()}
+
+def _dashboard_stats_params() -> Dict[str, str]:
+    """Bound parameters for DASHBOARD_STATS_SQL"""
+    return {
+        'messages_since': (datetime.now(timezone.utc) - timedelta(days=7)).isoformat(),
+        'interactions_since': (datetime.now() - timedelta(days=7)).isoformat()
+    }
+
+def _pivot_dashboard_stats(rows) -> Dict[str, Any]:
+    """Fold DASHBOARD_STATS_SQL rows into the stats dict (grouped metrics become nested dicts)"""
+    stats = {metric: {} for metric in DASHBOARD_GROUPED_METRICS}
+    for metric, key, value in rows:
+        if metric in DASHBOARD_GROUPED_METRICS:
+            stats[metric][key] = value
+        else:
+            stats[metric] = value
+    return stats
+
+# Contact pipeline aggregates for the lead tracking export, in one pass over contacts.
+# :follow_up_before is the cutoff for contacts last reached more than 3 whole days ago
+PIPELINE_STATS_SQL = """
+    SELECT
+        COUNT(*) AS total_contacts,
+        COALESCE(SUM(estimated_value), 0) AS total_pipeline_value,
+        AVG(lead_score) AS average_lead_score,
+        COALESCE(SUM(lead_score >= 70), 0) AS hot_leads,
+        COALESCE(SUM(estimated_value > 50000), 0) AS high_value_leads,
+        COALESCE(SUM(last_interaction <= :follow_up_before), 0) AS follow_up_needed
+    FROM contacts
+"""
+
+# Rows read per DataFrame chunk when streaming exports
+EXPORT_CHUNK_SIZE = 50_000
+
+# Queries behind export_to_dataframes / iter_export_frames, by table name
+EXPORT_QUERIES = {
+    # Contacts with organization info
+    'contacts': """
+        SELECT 
+            c.*,
+            o.name as organization_name,
+            o.industry as organization_industry,
+            o.organization_type
+        FROM contacts c
+        LEFT JOIN organizations o ON c.organization_id = o.organization_id
+        ORDER BY c.lead_score DESC, c.last_interaction DESC
+    """,
+    # Organizations
+    'organizations': """
+        SELECT * FROM organizations ORDER BY name
+    """,
+    # Group chats
+    'group_chats': """
+        SELECT 
+            gc.*,
+            o.name as organization_name
+        FROM group_chats gc
+        LEFT JOIN organizations o ON gc.organization_id = o.organization_id
+        ORDER BY gc.member_count DESC
+    """,
+    # Leads/Opportunities
+    'leads': """
+        SELECT 
+            l.*,
+            c.first_name,
+            c.last_name,
+            c.username,
+            o.name as organization_name
+        FROM leads l
+        JOIN contacts c ON l.contact_id = c.contact_id
+        LEFT JOIN organizations o ON c.organization_id = o.organization_id
+        ORDER BY l.estimated_value DESC, l.probability DESC
+    """,
+    # Recent interactions
+    'interactions': """
+        SELECT 
+            i.*,
+            c.first_name,
+            c.last_name,
+            c.username,
+            gc.title as chat_title
+        FROM interactions i
+        JOIN contacts c ON i.contact_id = c.contact_id
+        LEFT JOIN group_chats gc ON i.chat_id = gc.chat_id
+        ORDER BY i.interaction_date DESC
+    """,
+}
+
+# Bounded columns narrowed on export (lead_score/probability are 0-100, is_active is a flag)
+# instead of the int64/object columns read_sql_query infers
+EXPORT_NARROW_DTYPES = {
+    'contacts': {'lead_score': 'int8', 'probability': 'int8'},
+    'organizations': {'employee_count': 'int32'},
+    'group_chats': {'is_active': 'bool'},
+    'leads': {'probability': 'int8'},
+}
+
+# NULL-capable equivalents of the narrow numpy dtypes, per dtype backend
+_NULLABLE_DTYPES = {
+    'int8': {'numpy_nullable': 'Int8', 'pyarrow': 'int8[pyarrow]'},
+    'int32': {'numpy_nullable': 'Int32', 'pyarrow': 'int32[pyarrow]'},
+    'bool': {'numpy_nullable': 'boolean', 'pyarrow': 'bool[pyarrow]'},
+}
+
+def _narrow_export_frame(frame: pd.DataFrame, table: str, dtype_backend: Optional[str]) -> pd.DataFrame:
+    """Cast an export chunk's bounded columns to narrow dtypes; a column whose values do not fit is left as read"""
+    backend = dtype_backend or 'numpy_nullable'
+    for column, dtype in EXPORT_NARROW_DTYPES.get(table, {}).items():
+        if column in frame.columns:
+            try:
+                frame[column] = frame[column].astype(_NULLABLE_DTYPES[dtype][backend])
+            except (TypeError, ValueError, OverflowError):
+                pass
+    return frame
+
+def _write_frame_csv(frame: pd.DataFrame, csv_path: Path):
+    """Write a DataFrame to CSV, with pyarrow's C++ writer when installed (pandas' row formatter otherwise)"""
+    if PYARROW_AVAILABLE:
+        try:
+            pacsv.write_csv(pa.Table.from_pandas(frame, preserve_index=False), csv_path)
+            return
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            # Mixed-type object columns cannot always be converted to Arrow
+            logger.debug(f"pyarrow CSV writer unavailable for this frame, using pandas: {e}")
+    frame.to_csv(csv_path, index=False, chunksize=EXPORT_CHUNK_SIZE)
+
+# Slotted dataclasses skip the per-instance __dict__ (dataclass slots need Python 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+class _FromRow:
+    """Positional construction from rows selected with _column_list(cls), skipping the per-row dict"""
+    __slots__ = ()
+    
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
 # Enums for better data consistency
 class ContactType(Enum):
     LEAD = "lead"
@@ -59,8 +512,8 @@ class InteractionType(Enum):
     DEMO = "demo"
     PROPOSAL = "proposal"
 
-@dataclass
-class Contact:
+@dataclass(**_DATACLASS_SLOTS)
+class Contact(_FromRow):
     contact_id: int = None
     user_id: int = None
     first_name: str = ""
@@ -81,8 +534,8 @@ class Contact:
     created_at: str = None
     updated_at: str = None
 
-@dataclass
-class Organization:
+@dataclass(**_DATACLASS_SLOTS)
+class Organization(_FromRow):
     organization_id: int = None
     name: str = ""
     industry: str = ""
@@ -98,8 +551,8 @@ class Organization:
     created_at: str = None
     updated_at: str = None
 
-@dataclass
-class GroupChat:
+@dataclass(**_DATACLASS_SLOTS)
+class GroupChat(_FromRow):
     chat_id: int = None
     title: str = ""
     chat_type: str = ""
@@ -111,8 +564,8 @@ class GroupChat:
     created_at: str = None
     updated_at: str = None
 
-@dataclass
-class Interaction:
+@dataclass(**_DATACLASS_SLOTS)
+class Interaction(_FromRow):
     interaction_id: int = None
     contact_id: int = None
     chat_id: int = None
@@ -124,8 +577,8 @@ class Interaction:
     next_action: str = ""
     created_at: str = None
 
-@dataclass
-class Lead:
+@dataclass(**_DATACLASS_SLOTS)
+class Lead(_FromRow):
     lead_id: int = None
     contact_id: int = None
     opportunity_type: str = ""
@@ -143,18 +596,223 @@ class Lead:
     created_at: str = None
     updated_at: str = None
 
+def _column_list(cls, alias: str = "") -> str:
+    """SELECT list of a dataclass's columns in field order, for from_row"""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + field.name for field in fields(cls))
+
+CONTACT_COLUMNS = _column_list(Contact)
+ORGANIZATION_COLUMNS = _column_list(Organization)
+
+CONTACT_BY_USER_ID_SQL = f"SELECT {CONTACT_COLUMNS} FROM contacts WHERE user_id = ?"
+
+CONTACTS_BY_STATUS_SQL = f"""
+    SELECT {CONTACT_COLUMNS}
+    FROM contacts
+    WHERE lead_status = ?
+    ORDER BY lead_score DESC, last_interaction DESC
+"""
+
+CONTACTS_BY_TAG_SQL = f"""
+    SELECT {_column_list(Contact, 'c')}
+    FROM contact_tags t
+    JOIN contacts c ON c.contact_id = t.contact_id
+    WHERE t.tag = ?
+    ORDER BY c.lead_score DESC
+"""
+
+# Candidates for the Python-side tag check when contact_tags is unavailable
+CONTACTS_BY_TAG_SCAN_SQL = f"""
+    SELECT {CONTACT_COLUMNS} FROM contacts
+    WHERE tags LIKE ?
+    ORDER BY lead_score DESC
+"""
+
+ORGANIZATION_BY_ID_SQL = f"SELECT {ORGANIZATION_COLUMNS} FROM organizations WHERE organization_id = ?"
+
+ORGANIZATION_SEARCH_FTS_SQL = f"""
+    SELECT {_column_list(Organization, 'o')} FROM organizations_fts f
+    JOIN organizations o ON o.organization_id = f.rowid
+    WHERE organizations_fts MATCH ?
+    ORDER BY f.rank
+"""
+
+ORGANIZATION_SEARCH_LIKE_SQL = f"""
+    SELECT {ORGANIZATION_COLUMNS} FROM organizations 
+    WHERE name LIKE ? OR industry LIKE ? OR description LIKE ?
+    ORDER BY name
+"""
+
+# Columns update_contact may set (every Contact field except the primary key)
+ALLOWED_CONTACT_COLS = frozenset(field.name for field in fields(Contact)) - {'contact_id'}
+
+@lru_cache(maxsize=64)
+def _contact_update_sql(columns: Tuple[str, ...]) -> str:
+    """UPDATE statement for a sorted tuple of contact columns; identical text lets SQLite reuse the prepared plan"""
+    set_clauses = [f'{column} = ?' for column in columns]
+    if 'updated_at' not in columns:
+        set_clauses.append(f'updated_at = {SQL_NOW}')
+    return f"UPDATE contacts SET {', '.join(set_clauses)} WHERE contact_id = ?"
+
 class LeadTrackingDB:
+
     """Enhanced database for lead tracking and CRM functionality"""
     
     def __init__(self, db_path: str = "data/lead_tracking.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        
+        # With buffer_messages on, store_message buffers rows and writes them in one transaction
+        # per batch; it then returns before the write, write errors are only logged, and the
+        # owner must call flush_messages()/close() before exiting. Off by default.
+        self.buffer_messages = False
+        self.message_batch_size = 1000
+        self.message_flush_interval = 1.0  # seconds a buffered message may wait
+        self._message_buffer: List[Dict] = []
+        self._message_buffer_lock = threading.Lock()
+        self._message_flush_timer: Optional[threading.Timer] = None
+        
+        # user_id -> contact_id never changes once a contact exists, so lookups are cached (LRU)
+        self.contact_id_cache_size = 50_000
+        self._contact_id_cache: "OrderedDict[int, int]" = OrderedDict()
+        
+        # One long-lived connection shared by all methods (and the flush timer thread);
+        # its statement cache holds the module-level SQL constants once prepared
+        self._conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                     cached_statements=512)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+            PRAGMA mmap_size=268435456;
+        """)
+        self._lock = threading.RLock()
+        
+        # Read methods borrow read-only connections from a pool (opened on demand, up to
+        # read_pool_size) so they neither wait on the writer's lock nor on each other
+        self.read_pool_size = READ_POOL_SIZE
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._readers_opened = 0
+        self._readers_lock = threading.Lock()
+        
+        # get_dashboard_stats results are reused for stats_cache_ttl seconds; contact, lead,
+        # interaction and organization writes drop the cached copy, as do message batches that
+        # may have created contacts (message counts alone may lag by up to the TTL)
+        self.stats_cache_ttl = 60.0
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._stats_cache_lock = threading.Lock()
+        
+        # Separate aiosqlite connection for the *_async read methods, opened on first use
+        self._async_conn = None
+        self._async_conn_lock = asyncio.Lock()
+        
         self._init_database()
         logger.info("✅ Lead Tracking Database initialized")
     
+    @contextmanager
+    def _connection(self):
+        """Serialize access to the shared connection; commit on success, roll back on error"""
+        with self._lock:
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection for the read pool"""
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                               timeout=BUSY_TIMEOUT, check_same_thread=False, cached_statements=512)
+        conn.row_factory = sqlite3.Row
+        conn.executescript("""
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-16000;
+            PRAGMA mmap_size=268435456;
+        """)
+        # Prepare the point lookups now (NULL keys match no rows) so first calls skip parsing
+        for query in (CONTACT_BY_USER_ID_SQL, ORGANIZATION_BY_ID_SQL, CONTACTS_BY_STATUS_SQL):
+            conn.execute(query, (None,)).fetchall()
+        return conn
+    
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection from the pool, waiting if all are in use"""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._readers_lock:
+                open_new = self._readers_opened < self.read_pool_size
+                if open_new:
+                    self._readers_opened += 1
+            if open_new:
+                try:
+                    conn = self._open_reader()
+                except Exception:
+                    with self._readers_lock:
+                        self._readers_opened -= 1
+                    raise
+            else:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+    
+    async def _aconnect(self):
+        """Open (once) the aiosqlite connection used by the async read methods"""
+        async with self._async_conn_lock:
+            if self._async_conn is None:
+                conn = await aiosqlite.connect(self.db_path, timeout=BUSY_TIMEOUT)
+                conn.row_factory = aiosqlite.Row
+                await conn.execute('PRAGMA temp_store=MEMORY')
+                await conn.execute('PRAGMA cache_size=-64000')
+                await conn.execute('PRAGMA mmap_size=268435456')
+                self._async_conn = conn
+            return self._async_conn
+    
+    async def _fetch_async(self, query: str, params: Union[Tuple, Dict] = (), fetch_one: bool = False):
+        """Run a read query without blocking the event loop (a worker thread if aiosqlite is missing)"""
+        if not AIOSQLITE_AVAILABLE:
+            def fetch():
+                with self._reader() as conn:
+                    cursor = conn.execute(query, params)
+                    return cursor.fetchone() if fetch_one else cursor.fetchall()
+            return await asyncio.to_thread(fetch)
+        
+        conn = await self._aconnect()
+        async with conn.execute(query, params) as cursor:
+            return await cursor.fetchone() if fetch_one else await cursor.fetchall()
+    
+    def close(self):
+        """Write any buffered messages and close the database connection"""
+        self.flush_messages()
+        self.analyze()
+        with self._lock:
+            self._conn.close()
+        with self._readers_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._readers_opened -= 1
+    
+    async def close_async(self):
+        """close(), plus the aiosqlite connection used by the async read methods"""
+        async with self._async_conn_lock:
+            if self._async_conn is not None:
+                await self._async_conn.close()
+                self._async_conn = None
+        self.close()
+    
     def _init_database(self):
         """Initialize database with comprehensive schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.executescript("""
                 -- Organizations table
                 CREATE TABLE IF NOT EXISTS organizations (
@@ -270,56 +928,141 @@ class LeadTrackingDB:
                 -- Indexes for performance
                 CREATE INDEX IF NOT EXISTS idx_contacts_user_id ON contacts(user_id);
                 CREATE INDEX IF NOT EXISTS idx_contacts_organization ON contacts(organization_id);
-                CREATE INDEX IF NOT EXISTS idx_contacts_lead_status ON contacts(lead_status);
                 CREATE INDEX IF NOT EXISTS idx_messages_chat_id ON messages(chat_id);
                 CREATE INDEX IF NOT EXISTS idx_messages_contact_id ON messages(contact_id);
                 CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp);
                 CREATE INDEX IF NOT EXISTS idx_interactions_contact_id ON interactions(contact_id);
+                CREATE INDEX IF NOT EXISTS idx_interactions_date ON interactions(interaction_date);
                 CREATE INDEX IF NOT EXISTS idx_leads_contact_id ON leads(contact_id);
                 CREATE INDEX IF NOT EXISTS idx_leads_stage ON leads(stage);
+                
+                -- Ordered/partial indexes for the follow-up and pipeline queries
+                CREATE INDEX IF NOT EXISTS idx_contacts_followup ON contacts(last_interaction, contact_type, lead_score DESC)
+                    WHERE lead_status NOT IN ('closed_won', 'closed_lost');
+                CREATE INDEX IF NOT EXISTS idx_leads_pipeline ON leads(estimated_value DESC, probability DESC)
+                    WHERE stage NOT IN ('closed_lost');
+                -- Supersedes the former single-column lead_status index and removes get_contacts_by_status's sort
+                CREATE INDEX IF NOT EXISTS idx_contacts_status_score ON contacts(lead_status, lead_score DESC, last_interaction DESC);
+                DROP INDEX IF EXISTS idx_contacts_lead_status;
+                
+                -- Covers every column PIPELINE_STATS_SQL reads, so it scans this index instead of the wide
+                -- rows; read backwards it is also the hot-leads ORDER BY lead_score DESC, estimated_value DESC
+                CREATE INDEX IF NOT EXISTS idx_contacts_pipeline_stats ON contacts(lead_score, estimated_value, last_interaction);
+                -- Redundant with the indexes above, and each extra last_interaction index is rewritten on
+                -- every message that bumps a contact's last_interaction
+                DROP INDEX IF EXISTS idx_contacts_score;
+                DROP INDEX IF EXISTS idx_contacts_last_interaction;
+                
+                -- organization_id is the rowid, so organization joins are already primary key lookups
+                DROP INDEX IF EXISTS idx_org_pk_name;
             """)
             conn.commit()
+            
+            # Full-text search needs SQLite built with FTS5 (trigram tokenizer: 3.34+)
+            self._organizations_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'organizations_fts'"
+            ).fetchone() is not None
+            if not self._organizations_fts:
+                try:
+                    conn.executescript(ORGANIZATIONS_FTS_SCHEMA)
+                    self._organizations_fts = True
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"⚠️ Organization full-text search unavailable, using LIKE: {e}")
+            
+            # Tag index needs SQLite's JSON functions (built in since 3.38)
+            self._contact_tags_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'contact_tags'"
+            ).fetchone() is not None
+            if not self._contact_tags_index:
+                try:
+                    conn.executescript(CONTACT_TAGS_SCHEMA)
+                    self._contact_tags_index = True
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"⚠️ Contact tag index unavailable, scanning tags: {e}")
+            
+            # Messages are unique per (chat, Telegram message ID); databases written before that was
+            # enforced may hold duplicates, of which the latest stored copy is kept
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'idx_messages_chat_message'"
+            ).fetchone() is None:
+                conn.executescript("""
+                    DELETE FROM messages WHERE telegram_message_id IS NOT NULL AND message_id NOT IN (
+                        SELECT MAX(message_id) FROM messages
+                        WHERE telegram_message_id IS NOT NULL
+                        GROUP BY chat_id, telegram_message_id
+                    );
+                    CREATE UNIQUE INDEX idx_messages_chat_message ON messages(chat_id, telegram_message_id);
+                """)
+            
+            # Planner statistics: a first ANALYZE for new databases, then PRAGMA optimize
+            # (analyze()) refreshes them as tables grow. analysis_limit keeps ANALYZE sampling
+            # a bounded number of rows per index instead of reading whole tables
+            conn.execute(f"PRAGMA analysis_limit={ANALYSIS_ROW_LIMIT}")
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is None:
+                conn.execute("ANALYZE")
+            else:
+                conn.execute("PRAGMA optimize")
+    
+    def analyze(self):
+        """Refresh planner statistics for tables whose contents changed enough to matter"""
+        try:
+            with self._connection() as conn:
+                conn.execute("PRAGMA optimize")
+        except Exception as e:
+            logger.warning(f"⚠️ Error refreshing query planner statistics: {e}")
     
     # Organization Management
     def create_organization(self, org_data: Dict) -> int:
         """Create a new organization"""
         try:
             org = Organization(**org_data)
-            org.created_at = datetime.now().isoformat()
-            org.updated_at = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO organizations (
-                        name, industry, size, location, website, description,
-                        organization_type, funding_stage, market_cap, employee_count,
-                        tags, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                org_id = self._insert_returning_id(cursor, ORGANIZATION_INSERT_SQL, 'organization_id', (
                     org.name, org.industry, org.size, org.location, org.website,
                     org.description, org.organization_type, org.funding_stage,
-                    org.market_cap, org.employee_count, org.tags,
-                    org.created_at, org.updated_at
+                    org.market_cap, org.employee_count, org.tags
                 ))
-                org_id = cursor.lastrowid
                 conn.commit()
+                self._invalidate_dashboard_stats()
                 logger.info(f"✅ Created organization: {org.name} (ID: {org_id})")
                 return org_id
         except Exception as e:
             logger.error(f"❌ Error creating organization: {e}")
             return None
     
+    def create_organizations_bulk(self, orgs_data: List[Dict]) -> int:
+        """Create many organizations in one transaction; returns how many were inserted"""
+        try:
+            rows = []
+            for org_data in orgs_data:
+                org = Organization(**org_data)
+                rows.append((
+                    org.name, org.industry, org.size, org.location, org.website,
+                    org.description, org.organization_type, org.funding_stage,
+                    org.market_cap, org.employee_count, org.tags
+                ))
+            
+            with self._connection() as conn:
+                self._insert_rows(conn.cursor(), ORGANIZATION_INSERT_HEAD, ORGANIZATION_ROW_PLACEHOLDERS, rows)
+                conn.commit()
+                self._invalidate_dashboard_stats()
+                logger.info(f"✅ Created {len(rows)} organizations")
+                return len(rows)
+        except Exception as e:
+            logger.error(f"❌ Error creating organizations: {e}")
+            return 0
+    
     def get_organization(self, org_id: int) -> Optional[Organization]:
         """Get organization by ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM organizations WHERE organization_id = ?", (org_id,))
+                cursor.execute(ORGANIZATION_BY_ID_SQL, (org_id,))
                 row = cursor.fetchone()
                 if row:
-                    return Organization(**dict(row))
+                    return Organization.from_row(row)
                 return None
         except Exception as e:
             logger.error(f"❌ Error getting organization: {e}")
@@ -328,16 +1071,15 @@ class LeadTrackingDB:
     def search_organizations(self, query: str) -> List[Organization]:
         """Search organizations by name or industry"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM organizations 
-                    WHERE name LIKE ? OR industry LIKE ? OR description LIKE ?
-                    ORDER BY name
-                """, (f"%{query}%", f"%{query}%", f"%{query}%"))
+                if self._organizations_fts and len(query) >= FTS_MIN_QUERY_LENGTH:
+                    # Quoted as a single phrase so the query text is never parsed as FTS syntax
+                    cursor.execute(ORGANIZATION_SEARCH_FTS_SQL, ('"' + query.replace('"', '""') + '"',))
+                else:
+                    cursor.execute(ORGANIZATION_SEARCH_LIKE_SQL, (f"%{query}%", f"%{query}%", f"%{query}%"))
                 rows = cursor.fetchall()
-                return [Organization(**dict(row)) for row in rows]
+                return [Organization.from_row(row) for row in rows]
         except Exception as e:
             logger.error(f"❌ Error searching organizations: {e}")
             return []
@@ -347,36 +1089,32 @@ class LeadTrackingDB:
         """Create or update a contact"""
         try:
             contact = Contact(**contact_data)
-            contact.created_at = datetime.now().isoformat()
-            contact.updated_at = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 
                 # Check if contact exists by user_id
                 if contact.user_id:
-                    cursor.execute("SELECT contact_id FROM contacts WHERE user_id = ?", (contact.user_id,))
-                    existing = cursor.fetchone()
+                    existing = (self._cached_contact_ids([contact.user_id])
+                                or self._contact_ids_for_users(cursor, [contact.user_id]))
                     if existing:
-                        return self.update_contact(existing[0], contact_data)
+                        self._cache_contact_ids(existing)
+                        # user_id is the lookup key, so it is not an update (and keeps the cache intact)
+                        updates = {key: value for key, value in contact_data.items() if key != 'user_id'}
+                        return self.update_contact(existing[contact.user_id], updates)
                 
-                cursor.execute("""
-                    INSERT INTO contacts (
-                        user_id, first_name, last_name, username, phone_number, bio,
-                        organization_id, contact_type, lead_status, lead_score,
-                        estimated_value, probability, tags, notes, last_interaction,
-                        next_follow_up, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                contact_id = self._insert_returning_id(cursor, CONTACT_INSERT_SQL, 'contact_id', (
                     contact.user_id, contact.first_name, contact.last_name,
                     contact.username, contact.phone_number, contact.bio,
                     contact.organization_id, contact.contact_type, contact.lead_status,
                     contact.lead_score, contact.estimated_value, contact.probability,
                     contact.tags, contact.notes, contact.last_interaction,
-                    contact.next_follow_up, contact.created_at, contact.updated_at
+                    contact.next_follow_up
                 ))
-                contact_id = cursor.lastrowid
                 conn.commit()
+                self._invalidate_dashboard_stats()
+                if contact.user_id:
+                    self._cache_contact_ids({contact.user_id: contact_id})
                 logger.info(f"✅ Created contact: {contact.first_name} {contact.last_name} (ID: {contact_id})")
                 return contact_id
         except Exception as e:
@@ -386,26 +1124,27 @@ class LeadTrackingDB:
     def update_contact(self, contact_id: int, updates: Dict) -> bool:
         """Update contact information"""
         try:
-            updates['updated_at'] = datetime.now().isoformat()
-            
-            # Build dynamic update query
-            set_clauses = []
-            values = []
-            for key, value in updates.items():
-                if key != 'contact_id':
-                    set_clauses.append(f"{key} = ?")
-                    values.append(value)
-            
-            if not set_clauses:
-                return False
+            columns = tuple(sorted(key for key in updates if key != 'contact_id'))
+            unknown = set(columns) - ALLOWED_CONTACT_COLS
+            if unknown:
+                raise ValueError(f"Unknown contact columns: {', '.join(sorted(unknown))}")
             
+            values = [updates[column] for column in columns]
             values.append(contact_id)
             
-            with sqlite3.connect(self.db_path) as conn:
+            if 'user_id' in updates:
+                # The one write that can remap a user - drop this contact's old mapping and the new user's
+                with self._lock:
+                    stale = [user_id for user_id, cached_id in self._contact_id_cache.items() if cached_id == contact_id]
+                    stale.append(updates['user_id'])
+                    for user_id in stale:
+                        self._contact_id_cache.pop(user_id, None)
+            
+            with self._connection() as conn:
                 cursor = conn.cursor()
-                query = f"UPDATE contacts SET {', '.join(set_clauses)} WHERE contact_id = ?"
-                cursor.execute(query, values)
+                cursor.execute(_contact_update_sql(columns), values)
                 conn.commit()
+                self._invalidate_dashboard_stats()
                 logger.info(f"✅ Updated contact ID: {contact_id}")
                 return cursor.rowcount > 0
         except Exception as e:
@@ -415,56 +1154,75 @@ class LeadTrackingDB:
     def get_contact_by_user_id(self, user_id: int) -> Optional[Contact]:
         """Get contact by Telegram user ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM contacts WHERE user_id = ?", (user_id,))
+                cursor.execute(CONTACT_BY_USER_ID_SQL, (user_id,))
                 row = cursor.fetchone()
                 if row:
-                    return Contact(**dict(row))
+                    return Contact.from_row(row)
                 return None
         except Exception as e:
             logger.error(f"❌ Error getting contact: {e}")
             return None
     
+    async def get_contact_by_user_id_async(self, user_id: int) -> Optional[Contact]:
+        """Get contact by Telegram user ID without blocking the event loop"""
+        try:
+            row = await self._fetch_async(CONTACT_BY_USER_ID_SQL, (user_id,), fetch_one=True)
+            if row:
+                return Contact.from_row(row)
+            return None
+        except Exception as e:
+            logger.error(f"❌ Error getting contact: {e}")
+            return None
+    
     def get_contacts_by_status(self, status: str) -> List[Contact]:
         """Get contacts by lead status"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT c.*, o.name as organization_name 
-                    FROM contacts c
-                    LEFT JOIN organizations o ON c.organization_id = o.organization_id
-                    WHERE c.lead_status = ?
-                    ORDER BY c.lead_score DESC, c.last_interaction DESC
-                """, (status,))
-                rows = cursor.fetchall()
-                return [Contact(**dict(row)) for row in rows]
+                cursor.execute(CONTACTS_BY_STATUS_SQL, (status,))
+                return [Contact.from_row(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"❌ Error getting contacts by status: {e}")
             return []
     
+    def get_contacts_by_tag(self, tag: str) -> List[Contact]:
+        """Get contacts carrying a tag (case-insensitive)"""
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                if self._contact_tags_index:
+                    cursor.execute(CONTACTS_BY_TAG_SQL, (tag,))
+                    return [Contact.from_row(row) for row in cursor.fetchall()]
+                
+                cursor.execute(CONTACTS_BY_TAG_SCAN_SQL, (f"%{tag}%",))
+                contacts = []
+                for row in cursor.fetchall():
+                    contact = Contact.from_row(row)
+                    try:
+                        tags = json.loads(contact.tags)
+                    except (TypeError, ValueError):
+                        continue
+                    if isinstance(tags, list) and tag.lower() in (str(t).lower() for t in tags):
+                        contacts.append(contact)
+                return contacts
+        except Exception as e:
+            logger.error(f"❌ Error getting contacts by tag: {e}")
+            return []
+    
     # Group Chat Management
     def create_group_chat(self, chat_data: Dict) -> bool:
         """Create or update group chat"""
         try:
             chat = GroupChat(**chat_data)
-            chat.created_at = datetime.now().isoformat()
-            chat.updated_at = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO group_chats (
-                        chat_id, title, chat_type, member_count, description,
-                        organization_id, is_active, tags, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                cursor.execute(GROUP_CHAT_UPSERT_SQL, (
                     chat.chat_id, chat.title, chat.chat_type, chat.member_count,
                     chat.description, chat.organization_id, chat.is_active,
-                    chat.tags, chat.created_at, chat.updated_at
+                    chat.tags
                 ))
                 conn.commit()
                 logger.info(f"✅ Created/updated group chat: {chat.title}")
@@ -473,175 +1231,302 @@ class LeadTrackingDB:
             logger.error(f"❌ Error creating group chat: {e}")
             return False
     
+    def create_group_chats_bulk(self, chats_data: List[Dict]) -> int:
+        """Create or update many group chats in one transaction; returns how many were written"""
+        try:
+            rows = []
+            for chat_data in chats_data:
+                chat = GroupChat(**chat_data)
+                rows.append((
+                    chat.chat_id, chat.title, chat.chat_type, chat.member_count,
+                    chat.description, chat.organization_id, chat.is_active,
+                    chat.tags
+                ))
+            
+            with self._connection() as conn:
+                self._insert_rows(conn.cursor(), GROUP_CHAT_INSERT_HEAD, GROUP_CHAT_ROW_PLACEHOLDERS, rows,
+                                  GROUP_CHAT_UPSERT_CLAUSE)
+                conn.commit()
+                logger.info(f"✅ Created/updated {len(rows)} group chats")
+                return len(rows)
+        except Exception as e:
+            logger.error(f"❌ Error creating group chats: {e}")
+            return 0
+    
     # Message Storage
     def store_message(self, message_data: Dict) -> bool:
-        """Store message with enhanced metadata"""
+        """Store a message (or, with buffer_messages on, buffer it for a batched store_messages_bulk)"""
+        if not self.buffer_messages:
+            return self.store_messages_bulk([message_data]) == 1
+        
+        with self._message_buffer_lock:
+            self._message_buffer.append(message_data)
+            flush_now = len(self._message_buffer) >= self.message_batch_size
+            if not flush_now and self._message_flush_timer is None:
+                self._message_flush_timer = threading.Timer(self.message_flush_interval, self.flush_messages)
+                self._message_flush_timer.daemon = True
+                self._message_flush_timer.start()
+        
+        if flush_now:
+            return self.flush_messages()
+        return True
+    
+    def flush_messages(self) -> bool:
+        """Write all buffered messages"""
+        with self._message_buffer_lock:
+            batch, self._message_buffer = self._message_buffer, []
+            if self._message_flush_timer is not None:
+                self._message_flush_timer.cancel()
+                self._message_flush_timer = None
+        
+        if not batch:
+            return True
+        return self.store_messages_bulk(batch) == len(batch)
+    
+    def store_messages_bulk(self, batch: List[Dict]) -> int:
+        """Store a batch of messages, creating/touching their contacts and chats in one transaction"""
+        if not batch:
+            return 0
+        
         try:
-            # Ensure contact exists
-            if message_data.get('user_id'):
-                contact = self.get_contact_by_user_id(message_data['user_id'])
-                if not contact:
-                    # Create contact automatically
-                    contact_data = {
-                        'user_id': message_data.get('user_id'),
-                        'first_name': message_data.get('first_name', ''),
-                        'last_name': message_data.get('last_name', ''),
-                        'username': message_data.get('username', ''),
-                        'last_interaction': datetime.now().isoformat()
-                    }
-                    contact_id = self.create_contact(contact_data)
-                else:
-                    contact_id = contact.contact_id
-                    # Update last interaction
-                    self.update_contact(contact_id, {'last_interaction': datetime.now().isoformat()})
-            else:
-                contact_id = None
+            now = datetime.now().isoformat()
             
-            # Ensure group chat exists
-            if message_data.get('chat_id'):
-                chat_data = {
-                    'chat_id': message_data.get('chat_id'),
-                    'title': message_data.get('chat_title', f"Chat {message_data.get('chat_id')}"),
-                    'chat_type': message_data.get('chat_type', 'private')
-                }
-                self.create_group_chat(chat_data)
+            # First message per user supplies the names for contacts created here
+            users = {}
+            for message_data in batch:
+                if message_data.get('user_id'):
+                    users.setdefault(message_data['user_id'], message_data)
+            
+            # Last message per chat wins, as it would with one upsert per message
+            chats = {}
+            for message_data in batch:
+                if message_data.get('chat_id'):
+                    chats[message_data['chat_id']] = (
+                        message_data['chat_id'],
+                        message_data.get('chat_title', f"Chat {message_data['chat_id']}"),
+                        message_data.get('chat_type', 'private'),
+                        0, '', None, True, '', now, now
+                    )
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO messages (
-                        telegram_message_id, chat_id, contact_id, message_text,
-                        message_type, timestamp, is_outbound, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    message_data.get('message_id'),
-                    message_data.get('chat_id'),
-                    contact_id,
-                    message_data.get('message_text', ''),
-                    message_data.get('message_type', 'text'),
-                    message_data.get('timestamp', datetime.now().isoformat()),
-                    message_data.get('is_outbound', False),
-                    datetime.now().isoformat()
-                ))
+                cursor.execute("BEGIN IMMEDIATE")
+                
+                contact_rows = {
+                    user_id: (
+                        user_id, message_data.get('first_name', ''), message_data.get('last_name', ''),
+                        message_data.get('username', ''), ContactType.LEAD.value, LeadStatus.COLD.value,
+                        now, now, now
+                    )
+                    for user_id, message_data in users.items()
+                }
+                
+                # Senders whose contact id is cached only need their last interaction touched
+                contact_ids = self._cached_contact_ids(list(users))
+                uncached = [user_id for user_id in users if user_id not in contact_ids]
+                
+                if SQLITE_SUPPORTS_RETURNING:
+                    # One upsert per other sender creates or touches the contact and yields its id
+                    new_ids = {
+                        user_id: cursor.execute(MESSAGE_CONTACT_UPSERT_SQL, contact_rows[user_id]).fetchone()[0]
+                        for user_id in uncached
+                    }
+                else:
+                    # Resolve existing contacts in one query per SQLITE_MAX_VARIABLES users
+                    new_ids = self._contact_ids_for_users(cursor, uncached)
+                    contact_ids.update(new_ids)
+                    cursor.executemany(
+                        MESSAGE_CONTACT_INSERT_SQL.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1),
+                        [contact_rows[user_id] for user_id in uncached if user_id not in new_ids]
+                    )
+                    new_ids.update(self._contact_ids_for_users(
+                        cursor, [user_id for user_id in uncached if user_id not in new_ids]
+                    ))
+                
+                cursor.executemany(
+                    MESSAGE_CONTACT_TOUCH_SQL,
+                    [(now, now, contact_id) for contact_id in contact_ids.values()]
+                )
+                contact_ids.update(new_ids)
+                self._cache_contact_ids(new_ids)
+                
+                cursor.executemany(MESSAGE_GROUP_CHAT_UPSERT_SQL, list(chats.values()))
+                
+                cursor.executemany(MESSAGE_UPSERT_SQL, [
+                    (
+                        message_data.get('message_id'),
+                        message_data.get('chat_id'),
+                        contact_ids.get(message_data.get('user_id')),
+                        message_data.get('message_text', ''),
+                        message_data.get('message_type', 'text'),
+                        _message_timestamp(message_data.get('timestamp', now)),
+                        message_data.get('is_outbound', False),
+                        now
+                    )
+                    for message_data in batch
+                ])
                 conn.commit()
-                return True
+                if uncached:
+                    # Senders missing from the ID cache may be new contacts
+                    self._invalidate_dashboard_stats()
+                return len(batch)
         except Exception as e:
-            logger.error(f"❌ Error storing message: {e}")
-            return False
+            logger.error(f"❌ Error storing messages: {e}")
+            return 0
+    
+    def _cached_contact_ids(self, user_ids: List[int]) -> Dict[int, int]:
+        """Contact IDs already in the LRU cache for the given Telegram user IDs"""
+        with self._lock:
+            contact_ids = {}
+            for user_id in user_ids:
+                contact_id = self._contact_id_cache.get(user_id)
+                if contact_id is not None:
+                    self._contact_id_cache.move_to_end(user_id)
+                    contact_ids[user_id] = contact_id
+            return contact_ids
+    
+    def _cache_contact_ids(self, contact_ids: Dict[int, int]):
+        """Remember user_id -> contact_id mappings, evicting the least recently used"""
+        with self._lock:
+            self._contact_id_cache.update(contact_ids)
+            for user_id in contact_ids:
+                self._contact_id_cache.move_to_end(user_id)
+            while len(self._contact_id_cache) > self.contact_id_cache_size:
+                self._contact_id_cache.popitem(last=False)
+    
+    def _contact_ids_for_users(self, cursor: sqlite3.Cursor, user_ids: List[int]) -> Dict[int, int]:
+        """Map Telegram user IDs to contact IDs for the contacts that exist"""
+        contact_ids = {}
+        for start in range(0, len(user_ids), SQLITE_MAX_VARIABLES):
+            chunk = user_ids[start:start + SQLITE_MAX_VARIABLES]
+            cursor.execute(
+                f"SELECT user_id, contact_id FROM contacts WHERE user_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            contact_ids.update(cursor.fetchall())
+        return contact_ids
+    
+    def _insert_returning_id(self, cursor: sqlite3.Cursor, insert_sql: str, id_column: str, params: Tuple) -> int:
+        """Run a single-row INSERT and return the new row's ID (RETURNING, or lastrowid before SQLite 3.35)"""
+        if SQLITE_SUPPORTS_RETURNING:
+            # fetchall steps the statement to completion so the transaction can commit
+            return cursor.execute(f"{insert_sql} RETURNING {id_column}", params).fetchall()[0][0]
+        cursor.execute(insert_sql, params)
+        return cursor.lastrowid
+    
+    def _insert_rows(self, cursor: sqlite3.Cursor, insert_sql: str, row_placeholders: str, rows: List[Tuple],
+                     conflict_clause: str = ""):
+        """Insert rows with multi-row VALUES statements, as many rows per statement as the bound-parameter limit allows"""
+        if not rows:
+            return
+        rows_per_statement = max(SQLITE_MAX_VARIABLES // len(rows[0]), 1)
+        for start in range(0, len(rows), rows_per_statement):
+            chunk = rows[start:start + rows_per_statement]
+            cursor.execute(
+                insert_sql + ", ".join([row_placeholders] * len(chunk)) + conflict_clause,
+                [value for row in chunk for value in row]
+            )
     
     # Analytics and Reporting
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """Get comprehensive dashboard statistics"""
+        cached = self._cached_dashboard_stats()
+        if cached is not None:
+            return cached
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                
-                stats = {}
-                
-                # Contact stats
-                cursor.execute("SELECT COUNT(*) FROM contacts")
-                stats['total_contacts'] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT lead_status, COUNT(*) FROM contacts GROUP BY lead_status")
-                stats['contacts_by_status'] = dict(cursor.fetchall())
-                
-                cursor.execute("SELECT contact_type, COUNT(*) FROM contacts GROUP BY contact_type")
-                stats['contacts_by_type'] = dict(cursor.fetchall())
-                
-                # Organization stats
-                cursor.execute("SELECT COUNT(*) FROM organizations")
-                stats['total_organizations'] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT organization_type, COUNT(*) FROM organizations GROUP BY organization_type")
-                stats['organizations_by_type'] = dict(cursor.fetchall())
-                
-                # Lead stats
-                cursor.execute("SELECT COUNT(*) FROM leads")
-                stats['total_leads'] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT SUM(estimated_value) FROM leads WHERE stage NOT IN ('closed_lost')")
-                pipeline_value = cursor.fetchone()[0]
-                stats['pipeline_value'] = pipeline_value or 0
-                
-                cursor.execute("SELECT stage, COUNT(*) FROM leads GROUP BY stage")
-                stats['leads_by_stage'] = dict(cursor.fetchall())
-                
-                # Activity stats
-                cursor.execute("SELECT COUNT(*) FROM messages WHERE timestamp > datetime('now', '-7 days')")
-                stats['messages_last_7_days'] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM interactions WHERE interaction_date > datetime('now', '-7 days')")
-                stats['interactions_last_7_days'] = cursor.fetchone()[0]
-                
-                return stats
+                cursor.execute(DASHBOARD_STATS_SQL, _dashboard_stats_params())
+                return self._cache_dashboard_stats(_pivot_dashboard_stats(cursor.fetchall()))
         except Exception as e:
             logger.error(f"❌ Error getting dashboard stats: {e}")
             return {}
     
-    def export_to_dataframes(self) -> Dict[str, pd.DataFrame]:
-        """Export all data to pandas DataFrames for analysis"""
+    async def get_dashboard_stats_async(self) -> Dict[str, Any]:
+        """Get comprehensive dashboard statistics without blocking the event loop"""
+        cached = self._cached_dashboard_stats()
+        if cached is not None:
+            return cached
+        try:
+            rows = await self._fetch_async(DASHBOARD_STATS_SQL, _dashboard_stats_params())
+            return self._cache_dashboard_stats(_pivot_dashboard_stats(rows))
+        except Exception as e:
+            logger.error(f"❌ Error getting dashboard stats: {e}")
+            return {}
+    
+    def _cached_dashboard_stats(self) -> Optional[Dict[str, Any]]:
+        """A copy of the cached dashboard stats if still fresh"""
+        with self._stats_cache_lock:
+            if self._stats_cache is None or time.monotonic() - self._stats_cache[0] >= self.stats_cache_ttl:
+                return None
+            stats = self._stats_cache[1]
+        return _copy_dashboard_stats(stats)
+    
+    def _cache_dashboard_stats(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember freshly computed dashboard stats; returns them for the caller"""
+        with self._stats_cache_lock:
+            self._stats_cache = (time.monotonic(), stats)
+        return _copy_dashboard_stats(stats)
+    
+    def _invalidate_dashboard_stats(self):
+        """Drop the cached dashboard stats after a write they summarize"""
+        with self._stats_cache_lock:
+            self._stats_cache = None
+    
+    def iter_export_frames(self, table: str, chunksize: int = EXPORT_CHUNK_SIZE,
+                           dtype_backend: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Stream one export table as DataFrames of at most chunksize rows"""
+        kwargs = {'dtype_backend': dtype_backend} if dtype_backend else {}
+        
+        # A pooled reader: under WAL it runs alongside writers without holding
+        # the shared connection's lock while the caller consumes chunks
+        with self._reader() as conn:
+            for frame in pd.read_sql_query(EXPORT_QUERIES[table], conn, chunksize=chunksize, **kwargs):
+                yield _narrow_export_frame(frame, table, dtype_backend)
+    
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Get contact pipeline aggregates (counts, value, average score)"""
+        try:
+            with self._reader() as conn:
+                cursor = conn.execute(PIPELINE_STATS_SQL, {
+                    'follow_up_before': (datetime.now() - timedelta(days=4)).isoformat()
+                })
+                return dict(cursor.fetchone())
+        except Exception as e:
+            logger.error(f"❌ Error getting pipeline stats: {e}")
+            return {}
+    
+    def export_table_to_csv(self, table: str, csv_path: Union[str, Path]) -> int:
+        """Stream one export table straight from SQLite into a CSV file; returns the row count"""
+        with self._reader() as conn, open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            cursor = conn.execute(EXPORT_QUERIES[table])
+            writer = csv.writer(f)
+            writer.writerow([column[0] for column in cursor.description])
+            rows = 0
+            while True:
+                batch = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not batch:
+                    break
+                writer.writerows(batch)
+                rows += len(batch)
+            return rows
+    
+    def export_to_dataframes(self, dtype_backend: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """Export all data to pandas DataFrames for analysis
+        
+        dtype_backend='pyarrow' (pandas 2+, pyarrow installed) stores strings in Arrow
+        buffers instead of Python objects; missing values then become pd.NA.
+        """
         try:
             dataframes = {}
             
-            with sqlite3.connect(self.db_path) as conn:
-                # Contacts with organization info
-                dataframes['contacts'] = pd.read_sql_query("""
-                    SELECT 
-                        c.*,
-                        o.name as organization_name,
-                        o.industry as organization_industry,
-                        o.organization_type
-                    FROM contacts c
-                    LEFT JOIN organizations o ON c.organization_id = o.organization_id
-                    ORDER BY c.lead_score DESC, c.last_interaction DESC
-                """, conn)
-                
-                # Organizations
-                dataframes['organizations'] = pd.read_sql_query("""
-                    SELECT * FROM organizations ORDER BY name
-                """, conn)
-                
-                # Group chats
-                dataframes['group_chats'] = pd.read_sql_query("""
-                    SELECT 
-                        gc.*,
-                        o.name as organization_name
-                    FROM group_chats gc
-                    LEFT JOIN organizations o ON gc.organization_id = o.organization_id
-                    ORDER BY gc.member_count DESC
-                """, conn)
-                
-                # Leads/Opportunities
-                dataframes['leads'] = pd.read_sql_query("""
-                    SELECT 
-                        l.*,
-                        c.first_name,
-                        c.last_name,
-                        c.username,
-                        o.name as organization_name
-                    FROM leads l
-                    JOIN contacts c ON l.contact_id = c.contact_id
-                    LEFT JOIN organizations o ON c.organization_id = o.organization_id
-                    ORDER BY l.estimated_value DESC, l.probability DESC
-                """, conn)
-                
-                # Recent interactions
-                dataframes['interactions'] = pd.read_sql_query("""
-                    SELECT 
-                        i.*,
-                        c.first_name,
-                        c.last_name,
-                        c.username,
-                        gc.title as chat_title
-                    FROM interactions i
-                    JOIN contacts c ON i.contact_id = c.contact_id
-                    LEFT JOIN group_chats gc ON i.chat_id = gc.chat_id
-                    ORDER BY i.interaction_date DESC
-                """, conn)
-                
-                logger.info("✅ Data exported to DataFrames")
-                return dataframes
-                
+            for table in EXPORT_QUERIES:
+                frames = list(self.iter_export_frames(table, dtype_backend=dtype_backend))
+                dataframes[table] = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            
+            logger.info("✅ Data exported to DataFrames")
+            return dataframes
+            
         except Exception as e:
             logger.error(f"❌ Error exporting to DataFrames: {e}")
             return {}
@@ -649,84 +1534,64 @@ class LeadTrackingDB:
     def get_hot_leads(self, limit: int = 10) -> List[Dict]:
         """Get hot leads for immediate action"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        c.contact_id,
-                        c.first_name,
-                        c.last_name,
-                        c.username,
-                        c.lead_status,
-                        c.lead_score,
-                        c.estimated_value,
-                        c.probability,
-                        c.last_interaction,
-                        c.next_follow_up,
-                        o.name as organization_name,
-                        o.organization_type
-                    FROM contacts c
-                    LEFT JOIN organizations o ON c.organization_id = o.organization_id
-                    WHERE c.lead_status IN ('hot', 'qualified', 'proposal', 'negotiation')
-                       OR c.lead_score >= 70
-                    ORDER BY c.lead_score DESC, c.estimated_value DESC
-                    LIMIT ?
-                """, (limit,))
+                cursor.execute(HOT_LEADS_SQL, (limit,))
                 return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"❌ Error getting hot leads: {e}")
             return []
+    
+    async def get_hot_leads_async(self, limit: int = 10) -> List[Dict]:
+        """Get hot leads for immediate action without blocking the event loop"""
+        try:
+            return [dict(row) for row in await self._fetch_async(HOT_LEADS_SQL, (limit,))]
+        except Exception as e:
+            logger.error(f"❌ Error getting hot leads: {e}")
+            return []
 
     def get_follow_up_needed(self, days_threshold: int = 3) -> List[Dict]:
         """Get contacts that need follow-up"""
         try:
             threshold_date = (datetime.now() - timedelta(days=days_threshold)).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        c.*,
-                        o.name as organization_name,
-                        julianday('now') - julianday(c.last_interaction) as days_since_contact
-                    FROM contacts c
-                    LEFT JOIN organizations o ON c.organization_id = o.organization_id
-                    WHERE c.last_interaction < ?
-                       AND c.lead_status NOT IN ('closed_won', 'closed_lost')
-                       AND c.contact_type IN ('lead', 'customer', 'investor', 'partner')
-                    ORDER BY days_since_contact DESC, c.lead_score DESC
-                """, (threshold_date,))
+                cursor.execute(FOLLOW_UP_NEEDED_SQL, (threshold_date,))
                 return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"❌ Error getting follow-up needed: {e}")
             return []
+    
+    async def get_follow_up_needed_async(self, days_threshold: int = 3) -> List[Dict]:
+        """Get contacts that need follow-up without blocking the event loop"""
+        try:
+            threshold_date = (datetime.now() - timedelta(days=days_threshold)).isoformat()
+            return [dict(row) for row in await self._fetch_async(FOLLOW_UP_NEEDED_SQL, (threshold_date,))]
+        except Exception as e:
+            logger.error(f"❌ Error getting follow-up needed: {e}")
+            return []
 
     def add_interaction(self, interaction_data: Dict) -> bool:
         """Add an interaction record"""
         try:
             interaction = Interaction(**interaction_data)
-            interaction.created_at = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO interactions (
-                        contact_id, chat_id, interaction_type, interaction_date,
-                        subject, notes, outcome, next_action, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                cursor.execute(INTERACTION_INSERT_SQL, (
                     interaction.contact_id, interaction.chat_id, interaction.interaction_type,
                     interaction.interaction_date, interaction.subject, interaction.notes,
-                    interaction.outcome, interaction.next_action, interaction.created_at
+                    interaction.outcome, interaction.next_action
                 ))
-                conn.commit()
                 
-                # Update contact's last interaction
-                self.update_contact(interaction.contact_id, {
-                    'last_interaction': interaction.interaction_date or datetime.now().isoformat()
-                })
+                # Update contact's last interaction in the same transaction
+                cursor.execute(_contact_update_sql(('last_interaction',)), (
+                    interaction.interaction_date or datetime.now().isoformat(),
+                    interaction.contact_id
+                ))
+                conn.commit()
+                self._invalidate_dashboard_stats()
                 
                 logger.info(f"✅ Added interaction for contact {interaction.contact_id}")
                 return True
@@ -738,34 +1603,22 @@ class LeadTrackingDB:
         """Create a new lead/opportunity"""
         try:
             lead = Lead(**lead_data)
-            lead.created_at = datetime.now().isoformat()
-            lead.updated_at = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO leads (
-                        contact_id, opportunity_type, estimated_value, probability,
-                        stage, source, assigned_to, last_activity, next_follow_up,
-                        deal_size, timeline, decision_makers, pain_points,
-                        created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                lead_id = self._insert_returning_id(cursor, LEAD_INSERT_SQL, 'lead_id', (
                     lead.contact_id, lead.opportunity_type, lead.estimated_value,
                     lead.probability, lead.stage, lead.source, lead.assigned_to,
                     lead.last_activity, lead.next_follow_up, lead.deal_size,
-                    lead.timeline, lead.decision_makers, lead.pain_points,
-                    lead.created_at, lead.updated_at
+                    lead.timeline, lead.decision_makers, lead.pain_points
                 ))
-                lead_id = cursor.lastrowid
-                conn.commit()
                 
-                # Update contact with lead info
-                self.update_contact(lead.contact_id, {
-                    'estimated_value': lead.estimated_value,
-                    'probability': lead.probability,
-                    'lead_status': lead.stage
-                })
+                # Update contact with lead info in the same transaction
+                cursor.execute(_contact_update_sql(('estimated_value', 'lead_status', 'probability')), (
+                    lead.estimated_value, lead.stage, lead.probability, lead.contact_id
+                ))
+                conn.commit()
+                self._invalidate_dashboard_stats()
                 
                 logger.info(f"✅ Created lead for contact {lead.contact_id} (Lead ID: {lead_id})")
                 return lead_id
@@ -780,53 +1633,85 @@ class LeadTrackingDB:
                 logger.warning(f"Old database not found: {old_db_path}")
                 return False
             
-            with sqlite3.connect(old_db_path) as old_conn:
+            now = datetime.now().isoformat()
+            migrated = 0
+            
+            # Old messages are read and written MIGRATION_BATCH_SIZE at a time, all in one transaction
+            with closing(sqlite3.connect(old_db_path)) as old_conn, self._connection() as conn:
                 old_conn.row_factory = sqlite3.Row
-                cursor = old_conn.cursor()
+                old_cursor = old_conn.execute("SELECT * FROM messages")
                 
-                # Migrate messages and create contacts
-                cursor.execute("SELECT * FROM messages")
-                messages = cursor.fetchall()
-                
-                migrated_contacts = set()
-                migrated_chats = set()
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                contacts_before = cursor.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+                chats_before = cursor.execute("SELECT COUNT(*) FROM group_chats").fetchone()[0]
                 
-                for msg in messages:
-                    msg_dict = dict(msg)
+                while True:
+                    batch = [dict(msg) for msg in old_cursor.fetchmany(MIGRATION_BATCH_SIZE)]
+                    if not batch:
+                        break
                     
-                    # Create contact if not exists
-                    if msg_dict.get('user_id') and msg_dict['user_id'] not in migrated_contacts:
-                        contact_data = {
-                            'user_id': msg_dict['user_id'],
-                            'first_name': msg_dict.get('first_name', ''),
-                            'last_name': msg_dict.get('last_name', ''),
-                            'username': msg_dict.get('username', ''),
-                            'last_interaction': msg_dict.get('timestamp')
-                        }
-                        self.create_contact(contact_data)
-                        migrated_contacts.add(msg_dict['user_id'])
+                    # One row per sender: names from their first message, their latest timestamp
+                    senders = {}
+                    for msg_dict in batch:
+                        user_id = msg_dict.get('user_id')
+                        if not user_id:
+                            continue
+                        timestamp = msg_dict.get('timestamp')
+                        if user_id not in senders:
+                            senders[user_id] = [
+                                user_id, msg_dict.get('first_name', ''), msg_dict.get('last_name', ''),
+                                msg_dict.get('username', ''), ContactType.LEAD.value, LeadStatus.COLD.value,
+                                timestamp, now, now
+                            ]
+                        elif timestamp and timestamp > (senders[user_id][6] or ''):
+                            senders[user_id][6] = timestamp
                     
-                    # Create group chat if not exists
-                    if msg_dict.get('chat_id') and msg_dict['chat_id'] not in migrated_chats:
-                        chat_data = {
-                            'chat_id': msg_dict['chat_id'],
-                            'title': msg_dict.get('chat_title', f"Chat {msg_dict['chat_id']}"),
-                            'chat_type': 'group' if str(msg_dict['chat_id']).startswith('-') else 'private'
-                        }
-                        self.create_group_chat(chat_data)
-                        migrated_chats.add(msg_dict['chat_id'])
-                    
-                    # Store message
-                    self.store_message(msg_dict)
-                
-                logger.info(f"✅ Migrated {len(messages)} messages, {len(migrated_contacts)} contacts, {len(migrated_chats)} chats")
-                return True
+                    existing = self._contact_ids_for_users(cursor, list(senders))
+                    cursor.executemany(MESSAGE_CONTACT_INSERT_SQL, [
+                        tuple(row) for user_id, row in senders.items() if user_id not in existing
+                    ])
+                    cursor.executemany(MIGRATION_CONTACT_TOUCH_SQL, [
+                        (senders[user_id][6], now, contact_id, senders[user_id][6])
+                        for user_id, contact_id in existing.items()
+                    ])
+                    cursor.executemany(MIGRATION_GROUP_CHAT_INSERT_SQL, [
+                        (
+                            msg_dict['chat_id'],
+                            msg_dict.get('chat_title', f"Chat {msg_dict['chat_id']}"),
+                            'group' if str(msg_dict['chat_id']).startswith('-') else 'private',
+                            0, '', None, True, '', now, now
+                        )
+                        for msg_dict in batch if msg_dict.get('chat_id')
+                    ])
+                    cursor.executemany(MIGRATION_MESSAGE_UPSERT_SQL, [
+                        (
+                            msg_dict.get('message_id'),
+                            msg_dict.get('chat_id'),
+                            msg_dict.get('user_id'),
+                            msg_dict.get('message_text', ''),
+                            msg_dict.get('message_type', 'text'),
+                            _message_timestamp(msg_dict.get('timestamp', now)),
+                            msg_dict.get('is_outbound', False),
+                            now
+                        )
+                        for msg_dict in batch
+                    ])
+                    migrated += len(batch)
                 
+                new_contacts = cursor.execute("SELECT COUNT(*) FROM contacts").fetchone()[0] - contacts_before
+                new_chats = cursor.execute("SELECT COUNT(*) FROM group_chats").fetchone()[0] - chats_before
+                conn.commit()
+            
+            self._invalidate_dashboard_stats()
+            self.analyze()
+            logger.info(f"✅ Migrated {migrated} messages, {new_contacts} new contacts, {new_chats} new chats")
+            return True
+            
         except Exception as e:
             logger.error(f"❌ Error migrating from old database: {e}")
             return False
 
-
 class GoogleSheetsExporter:
     """Google Sheets integration for lead tracking"""
     
@@ -847,27 +1732,24 @@ class GoogleSheetsExporter:
     def export_leads_to_sheets(self, db: LeadTrackingDB, sheet_id: str = None) -> bool:
         """Export lead data to Google Sheets or CSV"""
         try:
-            # Get data from database
-            dataframes = db.export_to_dataframes()
-            
-            if not dataframes:
-                logger.error("No data to export")
-                return False
-            
             # Create exports directory
             export_dir = Path("exports")
             export_dir.mkdir(exist_ok=True)
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            # Export each dataframe to CSV
-            for table_name, df in dataframes.items():
-                csv_path = export_dir / f"{table_name}_{timestamp}.csv"
-                df.to_csv(csv_path, index=False)
-                logger.info(f"✅ Exported {table_name} to {csv_path}")
+            # Stream each table to CSV without building DataFrames; the tables are
+            # independent, so they are written in parallel on pooled reader connections
+            csv_paths = {table_name: export_dir / f"{table_name}_{timestamp}.csv" for table_name in EXPORT_QUERIES}
+            with ThreadPoolExecutor(max_workers=min(db.read_pool_size, len(csv_paths))) as executor:
+                row_counts = dict(zip(csv_paths, executor.map(db.export_table_to_csv, csv_paths, csv_paths.values())))
+            for table_name, rows in row_counts.items():
+                logger.info(f"✅ Exported {table_name} ({rows} rows) to {csv_paths[table_name]}")
             
-            # Create a comprehensive lead tracking sheet
-            self._create_lead_tracking_sheet(dataframes, export_dir, timestamp)
+            # Create a comprehensive lead tracking sheet (only contacts are needed in pandas)
+            contacts_df = pd.concat(db.iter_export_frames('contacts'), ignore_index=True)
+            self._create_lead_tracking_sheet({'contacts': contacts_df}, export_dir, timestamp,
+                                             db.get_pipeline_stats())
             
             return True
             
@@ -875,7 +1757,8 @@ class GoogleSheetsExporter:
             logger.error(f"❌ Error exporting to sheets: {e}")
             return False
     
-    def _create_lead_tracking_sheet(self, dataframes: Dict, export_dir: Path, timestamp: str):
+    def _create_lead_tracking_sheet(self, dataframes: Dict, export_dir: Path, timestamp: str,
+                                    pipeline_stats: Dict[str, Any]):
         """Create a comprehensive lead tracking spreadsheet"""
         try:
             contacts_df = dataframes.get('contacts', pd.DataFrame())
@@ -894,27 +1777,26 @@ class GoogleSheetsExporter:
             
             # Add calculated fields
             lead_summary['full_name'] = lead_summary['first_name'] + ' ' + lead_summary['last_name']
-            lead_summary['days_since_contact'] = pd.to_datetime('now') - pd.to_datetime(lead_summary['last_interaction'])
-            lead_summary['days_since_contact'] = lead_summary['days_since_contact'].dt.days
+            lead_summary['days_since_contact'] = pd.array(
+                _days_since(lead_summary['last_interaction'], datetime.now()), dtype='Int32'
+            )
             
             # Sort by lead score and estimated value
             lead_summary = lead_summary.sort_values(['lead_score', 'estimated_value'], ascending=[False, False])
             
             # Export lead tracking summary
             summary_path = export_dir / f"LEAD_TRACKING_SUMMARY_{timestamp}.csv"
-            lead_summary.to_csv(summary_path, index=False)
-            
-            # Create pipeline report
-            pipeline_stats = {
-                'Total Contacts': len(contacts_df),
-                'Total Pipeline Value': contacts_df['estimated_value'].sum(),
-                'Average Lead Score': contacts_df['lead_score'].mean(),
-                'Hot Leads (Score 70+)': len(contacts_df[contacts_df['lead_score'] >= 70]),
-                'High Value Leads (>$50k)': len(contacts_df[contacts_df['estimated_value'] > 50000]),
-                'Contacts Needing Follow-up': len(contacts_df[contacts_df['days_since_contact'] > 3])
-            }
+            _write_frame_csv(lead_summary, summary_path)
             
-            pipeline_df = pd.DataFrame(list(pipeline_stats.items()), columns=['Metric', 'Value'])
+            # Create pipeline report (aggregated by LeadTrackingDB.get_pipeline_stats)
+            pipeline_df = pd.DataFrame([
+                ('Total Contacts', pipeline_stats.get('total_contacts')),
+                ('Total Pipeline Value', pipeline_stats.get('total_pipeline_value')),
+                ('Average Lead Score', pipeline_stats.get('average_lead_score')),
+                ('Hot Leads (Score 70+)', pipeline_stats.get('hot_leads')),
+                ('High Value Leads (>$50k)', pipeline_stats.get('high_value_leads')),
+                ('Contacts Needing Follow-up', pipeline_stats.get('follow_up_needed'))
+            ], columns=['Metric', 'Value'])
             pipeline_path = export_dir / f"PIPELINE_STATS_{timestamp}.csv"
             pipeline_df.to_csv(pipeline_path, index=False)
             
@@ -926,8 +1808,11 @@ class GoogleSheetsExporter:
 
 
 # Utility functions for lead management
-def calculate_lead_score(contact: Dict, interactions_count: int = 0) -> int:
-    """Calculate lead score based on various factors"""
+def calculate_lead_score(contact: Dict, interactions_count: int = 0, now: Optional[datetime] = None) -> int:
+    """Calculate lead score based on various factors
+    
+    Callers scoring many contacts can pass one now for the whole batch.
+    """
     score = 0
     
     # Base scoring
@@ -952,7 +1837,7 @@ def calculate_lead_score(contact: Dict, interactions_count: int = 0) -> int:
     if contact.get('last_interaction'):
         try:
             last_interaction = datetime.fromisoformat(contact['last_interaction'])
-            days_ago = (datetime.now() - last_interaction).days
+            days_ago = ((now or datetime.now()) - last_interaction).days
             if days_ago <= 1:
                 score += 20
             elif days_ago <= 3:
@@ -973,6 +1858,62 @@ def calculate_lead_score(contact: Dict, interactions_count: int = 0) -> int:
     
     return min(score, 100)  # Cap at 100
 
+def _days_since(values: pd.Series, now: datetime) -> pd.Series:
+    """Whole days from each ISO timestamp to now (float), NaN where a value is missing or unparseable"""
+    try:
+        parsed = pd.to_datetime(values, errors='coerce', format='ISO8601')
+        if getattr(parsed.dtype, 'tz', None) is None:
+            # Plain datetime64 arithmetic: NaT becomes NaN, no intermediate timedelta Series
+            elapsed = np.datetime64(now, 'ns') - parsed.to_numpy(dtype='datetime64[ns]')
+            return pd.Series(np.floor(elapsed / np.timedelta64(1, 'D')), index=values.index)
+    except (TypeError, ValueError):
+        pass
+    
+    # Mixed or timezone-aware values: parse one by one, as calculate_lead_score does
+    def days(value):
+        try:
+            return (now - datetime.fromisoformat(value)).days
+        except (TypeError, ValueError):
+            return np.nan
+    return values.map(days).astype(float)
+
+def calculate_lead_scores_df(contacts_df: pd.DataFrame, interactions_counts=0) -> pd.Series:
+    """calculate_lead_score for every row of a contacts DataFrame at once
+    
+    interactions_counts is a scalar or a sequence aligned with the rows.
+    """
+    index = contacts_df.index
+    
+    def column(name, default):
+        if name in contacts_df.columns:
+            return contacts_df[name]
+        return pd.Series(default, index=index)
+    
+    contact_type = column('contact_type', '')
+    score = np.select(
+        [contact_type == 'investor', contact_type == 'partner', contact_type == 'customer'],
+        [30, 20, 15], 0
+    )
+    
+    org_type = column('organization_type', '')
+    score += np.select(
+        [org_type.isin(['vc_fund', 'defi_protocol']), org_type.isin(['exchange', 'blockchain'])],
+        [25, 20], 0
+    )
+    
+    score += np.minimum(np.asarray(interactions_counts, dtype=np.int64) * 5, 30)
+    
+    days_ago = _days_since(column('last_interaction', None), datetime.now())
+    score += np.select([days_ago <= 1, days_ago <= 3, days_ago <= 7], [20, 15, 10], 0)
+    
+    estimated_value = pd.to_numeric(column('estimated_value', 0), errors='coerce').fillna(0)
+    score += np.select(
+        [estimated_value > 100000, estimated_value > 50000, estimated_value > 10000],
+        [25, 15, 10], 0
+    )
+    
+    return pd.Series(np.minimum(score, 100), index=index, dtype=np.int64)
+
 def analyze_lead_health(db: LeadTrackingDB) -> Dict[str, Any]:
     """Analyze overall lead pipeline health"""
     try:
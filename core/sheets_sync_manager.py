@@ -20,6 +20,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from google.oauth2.service_account import Credentials
+from gspread.utils import absolute_range_name
 from gspread_formatting import format_cell_range, CellFormat, Color
 import time
 import os
@@ -45,8 +46,10 @@ class SheetsyncManager:
         self.client = None
         self.spreadsheet = None
         self.sync_batch_size = 100
+        self.batch_write_rows = 10_000  # rows per values.batchUpdate request
         self.retry_attempts = 3
         self.retry_delay = 2
+        self.max_concurrent_requests = 4  # per-table Sheets calls in flight during full sync
         
         self._init_sheets_client()
         logger.info("✅ Sheets Sync Manager initialized")
@@ -108,20 +111,60 @@ class SheetsyncManager:
             if not dataframes:
                 return {"success": False, "error": "No data to sync"}
             
-            # Sync each table
+            # Prepare every table's worksheet concurrently, then upload all values together
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            
+            async def bounded(func, *args):
+                async with semaphore:
+                    return await func(*args)
+            
+            pending = {}
             for table_name, df in dataframes.items():
+                if df.empty:
+                    sync_result["tables_synced"][table_name] = {"success": True, "records_synced": 0, "message": "No data in table"}
+                else:
+                    pending[table_name] = df
+                    sync_result["tables_synced"][table_name] = {"success": False, "error": "Upload pending"}
+            
+            results = await asyncio.gather(
+                *(bounded(self._call_with_backoff, self._prepare_table_worksheet, table_name, df)
+                  for table_name, df in pending.items()),
+                return_exceptions=True
+            )
+            
+            prepared = {}
+            for (table_name, df), result in zip(pending.items(), results):
+                if isinstance(result, Exception):
+                    error_msg = f"Error syncing {table_name}: {str(result)}"
+                    sync_result["tables_synced"][table_name] = {"success": False, "error": str(result)}
+                    sync_result["errors"].append(error_msg)
+                    logger.error(f"❌ {error_msg}")
+                else:
+                    prepared[table_name] = (result, len(df))
+            
+            if prepared:
                 try:
-                    result = await self._sync_table(table_name, df)
-                    sync_result["tables_synced"][table_name] = result
-                    sync_result["total_records"] += result.get("records_synced", 0)
+                    await self._call_with_backoff(self.batch_write, [
+                        update
+                        for (worksheet, values), _ in prepared.values()
+                        for update in self._build_value_ranges(worksheet.title, values)
+                    ])
                     
-                    if not result.get("success", False):
-                        sync_result["errors"].append(f"Failed to sync {table_name}: {result.get('error')}")
+                    await asyncio.gather(*(
+                        bounded(self._format_worksheet, worksheet, table_name)
+                        for table_name, ((worksheet, _), _) in prepared.items()
+                    ))
+                    
+                    for table_name, ((worksheet, _), record_count) in prepared.items():
+                        sync_result["tables_synced"][table_name] = {"success": True, "records_synced": record_count}
+                        sync_result["total_records"] += record_count
+                        logger.info(f"✅ Synced {record_count} records to {worksheet.title}")
                         
                 except Exception as e:
-                    error_msg = f"Error syncing {table_name}: {str(e)}"
-                    sync_result["errors"].append(error_msg)
-                    logger.error(f"❌ {error_msg}")
+                    for table_name in prepared:
+                        sync_result["tables_synced"][table_name] = {"success": False, "error": str(e)}
+                        sync_result["errors"].append(f"Failed to sync {table_name}: {e}")
+                    logger.error(f"❌ Error writing tables to Google Sheets: {e}")
             
             # Create dashboard worksheet
             dashboard_result = await self._create_dashboard_sheet(db)
@@ -199,32 +242,78 @@ class SheetsyncManager:
             if df.empty:
                 return {"success": True, "records_synced": 0, "message": "No data in table"}
             
-            worksheet_name = self._get_worksheet_name(table_name)
-            
-            # Try to get existing worksheet or create new one
-            try:
-                worksheet = self.spreadsheet.worksheet(worksheet_name)
-                # Clear existing data
-                worksheet.clear()
-            except gspread.WorksheetNotFound:
-                worksheet = self.spreadsheet.add_worksheet(title=worksheet_name, rows=len(df)+10, cols=len(df.columns)+5)
-            
-            # Prepare data for upload
-            data_to_upload = self._prepare_dataframe_for_sheets(df)
+            worksheet, values = await self._call_with_backoff(self._prepare_table_worksheet, table_name, df)
             
             # Upload data
-            worksheet.update([data_to_upload.columns.tolist()] + data_to_upload.values.tolist())
+            await self._call_with_backoff(self.batch_write, self._build_value_ranges(worksheet.title, values))
             
             # Apply formatting
             await self._format_worksheet(worksheet, table_name)
             
-            logger.info(f"✅ Synced {len(df)} records to {worksheet_name}")
+            logger.info(f"✅ Synced {len(df)} records to {worksheet.title}")
             return {"success": True, "records_synced": len(df)}
             
         except Exception as e:
             logger.error(f"❌ Error syncing table {table_name}: {e}")
             return {"success": False, "error": str(e)}
     
+    async def _call_with_backoff(self, func, *args):
+        """Run a blocking Sheets call in a thread, retrying rate-limit (429) errors with exponential backoff"""
+        for attempt in range(self.retry_attempts + 1):
+            try:
+                return await asyncio.to_thread(func, *args)
+            except gspread.exceptions.APIError as e:
+                status = getattr(getattr(e, 'response', None), 'status_code', None)
+                if status != 429 or attempt == self.retry_attempts:
+                    raise
+                delay = self.retry_delay * 2 ** attempt
+                logger.warning(f"⚠️ Sheets rate limit hit, retrying in {delay}s")
+                await asyncio.sleep(delay)
+    
+    def _prepare_table_worksheet(self, table_name: str, df: pd.DataFrame) -> Tuple[Any, List[List[str]]]:
+        """Get or create and clear the table's worksheet; returns it with the rows to upload"""
+        worksheet_name = self._get_worksheet_name(table_name)
+        
+        # Try to get existing worksheet or create new one
+        try:
+            worksheet = self.spreadsheet.worksheet(worksheet_name)
+            # Clear existing data
+            worksheet.clear()
+        except gspread.WorksheetNotFound:
+            worksheet = self.spreadsheet.add_worksheet(title=worksheet_name, rows=len(df)+10, cols=len(df.columns)+5)
+        
+        # Prepare data for upload
+        data_to_upload = self._prepare_dataframe_for_sheets(df)
+        return worksheet, [data_to_upload.columns.tolist()] + data_to_upload.values.tolist()
+    
+    def _build_value_ranges(self, worksheet_title: str, values: List[List[str]]) -> List[Dict[str, Any]]:
+        """Split a worksheet's rows into ValueRanges of at most batch_write_rows rows"""
+        return [
+            {
+                "range": absolute_range_name(worksheet_title, f"A{start + 1}"),
+                "values": values[start:start + self.batch_write_rows]
+            }
+            for start in range(0, len(values), self.batch_write_rows)
+        ]
+    
+    def batch_write(self, updates: List[Dict[str, Any]]) -> int:
+        """Write ValueRanges with values.batchUpdate, one request per ~batch_write_rows rows"""
+        requests_made = 0
+        batch, batch_rows = [], 0
+        for update in updates:
+            if batch and batch_rows + len(update["values"]) > self.batch_write_rows:
+                self.spreadsheet.values_batch_update({"valueInputOption": "RAW", "data": batch})
+                requests_made += 1
+                batch, batch_rows = [], 0
+            batch.append(update)
+            batch_rows += len(update["values"])
+        
+        if batch:
+            self.spreadsheet.values_batch_update({"valueInputOption": "RAW", "data": batch})
+            requests_made += 1
+        
+        return requests_made
+    
     async def _sync_table_incremental(self, table_name: str, syncs: List[Dict], db: LocalDatabaseManager) -> Dict[str, Any]:
         """Sync specific records from a table"""
         try:
@@ -237,20 +326,18 @@ class SheetsyncManager:
                 # If worksheet doesn't exist, fall back to full sync
                 return await self._sync_table_fallback(table_name, db)
             
-            records_synced = 0
+            # Collect rows for the whole table and append them in one request
+            rows, synced_ids = [], []
             
             for sync in syncs:
                 try:
                     # Get the record data
                     record_data = await self._get_record_data(table_name, sync['record_id'], db)
+                    row_data = self._record_to_row(record_data, table_name) if record_data else None
                     
-                    if record_data:
-                        # Update or insert record in worksheet
-                        await self._upsert_record_in_worksheet(worksheet, record_data, table_name)
-                        
-                        # Mark sync as completed
-                        await db.mark_sync_completed(sync['sync_id'], success=True)
-                        records_synced += 1
+                    if row_data:
+                        rows.append(row_data)
+                        synced_ids.append(sync['sync_id'])
                         
                     else:
                         # Record not found, mark sync as failed
@@ -261,7 +348,21 @@ class SheetsyncManager:
                     await db.mark_sync_completed(sync['sync_id'], success=False, error_message=str(e))
                     logger.error(f"❌ Error syncing record {sync['record_id']}: {e}")
             
-            return {"success": True, "records_synced": records_synced}
+            if rows:
+                try:
+                    await self._call_with_backoff(worksheet.append_rows, rows)
+                except Exception as e:
+                    # Only the appended syncs failed; the ones already marked above keep their status
+                    for sync_id in synced_ids:
+                        await db.mark_sync_completed(sync_id, success=False, error_message=str(e))
+                    logger.error(f"❌ Error appending rows to {worksheet_name}: {e}")
+                    return {"success": False, "error": str(e)}
+                
+                # Mark syncs as completed
+                for sync_id in synced_ids:
+                    await db.mark_sync_completed(sync_id, success=True)
+            
+            return {"success": True, "records_synced": len(rows)}
             
         except Exception as e:
             # Mark all syncs as failed
@@ -345,7 +446,7 @@ class SheetsyncManager:
             )
             
             # Apply header formatting to first row
-            format_cell_range(worksheet, 'A1:Z1', header_format)
+            await self._call_with_backoff(format_cell_range, worksheet, 'A1:Z1', header_format)
             
             # Auto-resize columns (not available in gspread, but we can set reasonable widths)
             # This is a limitation we'll document
@@ -429,42 +530,31 @@ class SheetsyncManager:
             logger.error(f"❌ Error creating dashboard sheet: {e}")
             return {"success": False, "error": str(e)}
     
-    async def _upsert_record_in_worksheet(self, worksheet, record_data: Dict, table_name: str):
-        """Insert or update a record in worksheet"""
-        # This is a simplified implementation
-        # In a production system, you'd want more sophisticated record matching and updating
-        try:
-            # For now, we'll append new records
-            # In the future, implement record matching and updating logic
-            
-            # Convert record to row format
-            if table_name == 'contacts':
-                row_data = [
-                    record_data.get('contact_id', ''),
-                    record_data.get('first_name', ''),
-                    record_data.get('last_name', ''),
-                    record_data.get('username', ''),
-                    record_data.get('email', ''),
-                    record_data.get('phone', ''),
-                    record_data.get('organization_name', ''),
-                    record_data.get('contact_type', ''),
-                    record_data.get('lead_status', ''),
-                    record_data.get('lead_score', 0),
-                    record_data.get('estimated_value', 0),
-                    record_data.get('probability', 0),
-                    json.dumps(record_data.get('tags', [])),
-                    record_data.get('notes', ''),
-                    str(record_data.get('last_interaction', '')),
-                    str(record_data.get('next_follow_up', '')),
-                    str(record_data.get('created_at', '')),
-                    str(record_data.get('updated_at', ''))
-                ]
-                
-                worksheet.append_row(row_data)
-                
-        except Exception as e:
-            logger.error(f"❌ Error upserting record: {e}")
-            raise
+    def _record_to_row(self, record_data: Dict, table_name: str) -> Optional[List[Any]]:
+        """Convert a record to its worksheet row; None for tables without a row layout"""
+        # Record matching/updating is not implemented yet - rows are appended
+        if table_name == 'contacts':
+            return [
+                record_data.get('contact_id', ''),
+                record_data.get('first_name', ''),
+                record_data.get('last_name', ''),
+                record_data.get('username', ''),
+                record_data.get('email', ''),
+                record_data.get('phone', ''),
+                record_data.get('organization_name', ''),
+                record_data.get('contact_type', ''),
+                record_data.get('lead_status', ''),
+                record_data.get('lead_score', 0),
+                record_data.get('estimated_value', 0),
+                record_data.get('probability', 0),
+                json.dumps(record_data.get('tags', [])),
+                record_data.get('notes', ''),
+                str(record_data.get('last_interaction', '')),
+                str(record_data.get('next_follow_up', '')),
+                str(record_data.get('created_at', '')),
+                str(record_data.get('updated_at', ''))
+            ]
+        return None
     
     async def _sync_table_fallback(self, table_name: str, db: LocalDatabaseManager) -> Dict[str, Any]:
         """Fallback to full table sync if incremental fails"""
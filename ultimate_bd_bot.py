@@ -116,10 +116,10 @@ class UltimateBDBot:
             logger.info("✅ Smart Sync initialized")
             
             # Initialize differential backup
-            from core.differential_backup import DifferentialBackup
-            self.differential_backup = DifferentialBackup(
-                backup_root=os.getenv('BACKUP_ROOT', 'backups'),
-                chunk_size=int(os.getenv('BACKUP_CHUNK_SIZE', str(64 * 1024)))
+            from core.differential_backup import DifferentialBackupManager
+            self.differential_backup = DifferentialBackupManager(
+                backup_dir=os.getenv('BACKUP_ROOT', 'backups'),
+                dedup_chunks=os.getenv('BACKUP_DEDUP_CHUNKS', 'false').lower() == 'true'
             )
             logger.info("✅ Differential Backup initialized")
             
@@ -817,7 +817,7 @@ Built to maximize deal closure with AI intelligence! 🎯
             progress_msg = await update.message.reply_text("📊 **Generating Leads Dashboard...**\n\n⏳ Analyzing lead pipeline...")
             
             # Get dashboard stats
-            stats = self.lead_db.get_dashboard_stats()
+            stats = await self.lead_db.get_dashboard_stats_async()
             
             if not stats:
                 await progress_msg.edit_text("📊 **Leads Dashboard**\n\n⚠️ No lead data available. Import your data first using `/migrate`")
@@ -875,7 +875,7 @@ Built to maximize deal closure with AI intelligence! 🎯
             
             progress_msg = await update.message.reply_text(f"🔥 **Finding Hot Leads...**\n\n⏳ Analyzing top {limit} opportunities...")
             
-            hot_leads = self.lead_db.get_hot_leads(limit=limit)
+            hot_leads = await self.lead_db.get_hot_leads_async(limit=limit)
             
             if not hot_leads:
                 await progress_msg.edit_text("🔥 **Hot Leads**\n\n✅ No hot leads found. Time to work on lead generation!")
@@ -938,7 +938,7 @@ Built to maximize deal closure with AI intelligence! 🎯
             
             progress_msg = await update.message.reply_text(f"📞 **Finding Follow-ups...**\n\n⏳ Contacts not contacted in {days}+ days...")
             
-            follow_ups = self.lead_db.get_follow_up_needed(days_threshold=days)
+            follow_ups = await self.lead_db.get_follow_up_needed_async(days_threshold=days)
             
             if not follow_ups:
                 await progress_msg.edit_text(f"📞 **Follow-ups Needed**\n\n✅ All contacts reached within {days} days. Great job!")
@@ -1022,7 +1022,7 @@ Built to maximize deal closure with AI intelligence! 🎯
             
             if success:
                 # Get stats after migration
-                stats = self.lead_db.get_dashboard_stats()
+                stats = await self.lead_db.get_dashboard_stats_async()
                 
                 migrate_msg = f"🔄 **Migration Complete!**\n\n"
                 migrate_msg += f"✅ **Data Imported:**\n"
@@ -1578,6 +1578,10 @@ Built to maximize deal closure with AI intelligence! 🎯
             await self.application.start()
             await self.application.updater.start_polling()
             
+            # Back up whatever changed since the last run (a no-op if the database is unchanged)
+            if self.differential_backup:
+                await self.differential_backup.create_backup()
+            
             self.is_running = True
             logger.info("✅ Ultimate BD Bot is running!")
             logger.info("🎯 Ready for AI-powered deal closing!")
@@ -1597,6 +1601,13 @@ Built to maximize deal closure with AI intelligence! 🎯
                 await self.application.updater.stop()
                 await self.application.stop()
             
+            if self.differential_backup:
+                await self.differential_backup.create_backup()
+            
+            lead_db = getattr(self, 'lead_db', None)
+            if lead_db:
+                await lead_db.close_async()
+            
             logger.info("✅ Ultimate BD Bot stopped")
             
         except Exception as e: